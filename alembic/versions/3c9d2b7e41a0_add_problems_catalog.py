@@ -0,0 +1,41 @@
+"""add_problems_catalog
+
+Revision ID: 3c9d2b7e41a0
+Revises: fa134401ebeb
+Create Date: 2026-10-18 10:12:40.318502
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9d2b7e41a0'
+down_revision: Union[str, None] = 'fa134401ebeb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The app's create_all() may have created the table (and its index) before migrations ran
+    if sa.inspect(op.get_bind()).has_table('problems'):
+        return
+
+    op.create_table('problems',
+    sa.Column('title_slug', sa.String(length=200), nullable=False),
+    sa.Column('question_id', sa.String(length=20), nullable=True),
+    sa.Column('frontend_id', sa.String(length=20), nullable=True),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('difficulty', sa.String(length=10), nullable=False),
+    sa.Column('topic_tags', sa.JSON(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('title_slug')
+    )
+    op.create_index(op.f('ix_problems_question_id'), 'problems', ['question_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_problems_question_id'), table_name='problems')
+    op.drop_table('problems')
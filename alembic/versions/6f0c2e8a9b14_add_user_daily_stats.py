@@ -0,0 +1,49 @@
+"""add_user_daily_stats
+
+Revision ID: 6f0c2e8a9b14
+Revises: d5a81f3c6e29
+Create Date: 2026-10-18 17:42:09.861245
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f0c2e8a9b14'
+down_revision: Union[str, None] = 'd5a81f3c6e29'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The app's create_all() may have created the (empty or partly written) table before migrations ran
+    if not sa.inspect(op.get_bind()).has_table('user_daily_stats'):
+        op.create_table('user_daily_stats',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('difficulty', sa.String(length=10), nullable=False),
+        sa.Column('tasks_count', sa.Integer(), nullable=False),
+        sa.Column('xp_sum', sa.Integer(), nullable=False),
+        sa.Column('time_spent_sum', sa.Integer(), nullable=False),
+        sa.Column('timed_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('user_id', 'date', 'difficulty')
+        )
+
+    # Backfill from existing tasks (same aggregate as daily_stats.rebuild_daily_stats), replacing any rows
+    # the app wrote since create_all() so the rollup matches solved_tasks exactly
+    op.execute('DELETE FROM user_daily_stats')
+    op.execute(
+        'INSERT INTO user_daily_stats '
+        '(user_id, date, difficulty, tasks_count, xp_sum, time_spent_sum, timed_count) '
+        'SELECT user_id, date, difficulty, COUNT(*), SUM(points), COALESCE(SUM(time_spent), 0), COUNT(time_spent) '
+        'FROM solved_tasks WHERE user_id IS NOT NULL '
+        'GROUP BY user_id, date, difficulty'
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('user_daily_stats')
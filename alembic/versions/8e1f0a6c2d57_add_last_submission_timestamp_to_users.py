@@ -0,0 +1,26 @@
+"""add_last_submission_timestamp_to_users
+
+Revision ID: 8e1f0a6c2d57
+Revises: 3c9d2b7e41a0
+Create Date: 2026-10-18 12:41:09.527361
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e1f0a6c2d57'
+down_revision: Union[str, None] = '3c9d2b7e41a0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('last_submission_timestamp', sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'last_submission_timestamp')
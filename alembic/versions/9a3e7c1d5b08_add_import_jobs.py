@@ -0,0 +1,52 @@
+"""add_import_jobs
+
+Revision ID: 9a3e7c1d5b08
+Revises: 6f0c2e8a9b14
+Create Date: 2026-10-18 21:14:37.502816
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a3e7c1d5b08'
+down_revision: Union[str, None] = '6f0c2e8a9b14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The app's create_all() may have created the table (and its indexes) before migrations ran
+    if sa.inspect(op.get_bind()).has_table('import_jobs'):
+        return
+
+    op.create_table('import_jobs',
+    sa.Column('id', sa.String(length=32), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=True),
+    sa.Column('path', sa.String(length=500), nullable=False),
+    sa.Column('size_bytes', sa.BigInteger(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('rows_done', sa.Integer(), nullable=False),
+    sa.Column('bytes_done', sa.BigInteger(), nullable=False),
+    sa.Column('tasks_imported', sa.Integer(), nullable=False),
+    sa.Column('error_count', sa.Integer(), nullable=False),
+    sa.Column('errors', sa.JSON(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_import_jobs_user_id'), 'import_jobs', ['user_id'], unique=False)
+    op.create_index(op.f('ix_import_jobs_status'), 'import_jobs', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_import_jobs_status'), table_name='import_jobs')
+    op.drop_index(op.f('ix_import_jobs_user_id'), table_name='import_jobs')
+    op.drop_table('import_jobs')
@@ -0,0 +1,29 @@
+"""add_sync_identity_to_solved_tasks
+
+Revision ID: b47c5e9d03f2
+Revises: 8e1f0a6c2d57
+Create Date: 2026-10-18 14:05:52.184730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b47c5e9d03f2'
+down_revision: Union[str, None] = '8e1f0a6c2d57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Only synced tasks carry a slug; NULL slugs (manual / imported tasks) never conflict
+    op.add_column('solved_tasks', sa.Column('title_slug', sa.String(length=200), nullable=True))
+    op.create_index('uq_solved_tasks_user_slug_date', 'solved_tasks', ['user_id', 'title_slug', 'date'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_solved_tasks_user_slug_date', table_name='solved_tasks')
+    op.drop_column('solved_tasks', 'title_slug')
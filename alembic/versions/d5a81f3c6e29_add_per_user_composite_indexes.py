@@ -0,0 +1,47 @@
+"""add_per_user_composite_indexes
+
+Revision ID: d5a81f3c6e29
+Revises: b47c5e9d03f2
+Create Date: 2026-10-18 16:20:41.503117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a81f3c6e29'
+down_revision: Union[str, None] = 'b47c5e9d03f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TIMED = sa.text('time_spent IS NOT NULL')
+
+
+def upgrade() -> None:
+    # (user_id, date) covers every per-user date filter/sort; it makes the single-column user_id index redundant
+    op.create_index('ix_solved_tasks_user_date', 'solved_tasks', ['user_id', 'date'])
+    op.create_index(
+        'ix_solved_tasks_user_date_timed', 'solved_tasks', ['user_id', 'date'],
+        postgresql_where=TIMED, sqlite_where=TIMED,
+    )
+    op.drop_index('ix_solved_tasks_user_id', table_name='solved_tasks')
+
+    # Keep the oldest goal of any duplicated month (the one the app has been reading) before enforcing uniqueness
+    op.execute(
+        'DELETE FROM month_goals WHERE id NOT IN '
+        '(SELECT MIN(id) FROM month_goals GROUP BY user_id, year, month)'
+    )
+    op.create_index('uq_month_goals_user_year_month', 'month_goals', ['user_id', 'year', 'month'], unique=True)
+    op.drop_index('ix_month_goals_user_id', table_name='month_goals')
+
+
+def downgrade() -> None:
+    op.create_index('ix_month_goals_user_id', 'month_goals', ['user_id'])
+    op.drop_index('uq_month_goals_user_year_month', table_name='month_goals')
+
+    op.create_index('ix_solved_tasks_user_id', 'solved_tasks', ['user_id'])
+    op.drop_index('ix_solved_tasks_user_date_timed', table_name='solved_tasks')
+    op.drop_index('ix_solved_tasks_user_date', table_name='solved_tasks')
@@ -11,6 +11,18 @@ interface Task {
   notes: string | null;
 }
 
+interface ImportJob {
+  id: string;
+  status: 'pending' | 'running' | 'completed' | 'failed';
+  progress: number | null;
+  tasks_imported: number;
+  message?: string;
+  error: string | null;
+}
+
+// Interval between import job status requests
+const IMPORT_POLL_INTERVAL_MS = 1000;
+
 interface RecentTasksTableProps {
   tasks: Task[];
   onTasksUpdated?: () => void;
@@ -19,12 +31,34 @@ interface RecentTasksTableProps {
 const RecentTasksTable: React.FC<RecentTasksTableProps> = ({ tasks, onTasksUpdated }) => {
   const { token } = useAuth();
   const [isImporting, setIsImporting] = useState(false);
+  const [importProgress, setImportProgress] = useState<number | null>(null);
   const fileInputRef = useRef<HTMLInputElement>(null);
 
   const handleImportClick = () => {
     fileInputRef.current?.click();
   };
 
+  const waitForImportJob = async (jobId: string): Promise<ImportJob> => {
+    for (;;) {
+      await new Promise((resolve) => setTimeout(resolve, IMPORT_POLL_INTERVAL_MS));
+
+      const response = await fetch(`/api/import/jobs/${jobId}`, {
+        headers: {
+          'Authorization': `Bearer ${token}`
+        }
+      });
+      if (!response.ok) {
+        throw new Error(`HTTP ${response.status}`);
+      }
+
+      const job: ImportJob = await response.json();
+      if (job.status === 'completed' || job.status === 'failed') {
+        return job;
+      }
+      setImportProgress(job.progress);
+    }
+  };
+
   const handleFileChange = async (event: React.ChangeEvent<HTMLInputElement>) => {
     const file = event.target.files?.[0];
     if (!file) return;
@@ -35,7 +69,8 @@ const RecentTasksTable: React.FC<RecentTasksTableProps> = ({ tasks, onTasksUpdat
     formData.append('file', file);
 
     try {
-      const response = await fetch('/api/import/csv', {
+      // Imported by a background job: large files don't hit the proxy timeout
+      const response = await fetch('/api/import/csv?background=true', {
         method: 'POST',
         headers: {
           'Authorization': `Bearer ${token}`
@@ -45,18 +80,26 @@ const RecentTasksTable: React.FC<RecentTasksTableProps> = ({ tasks, onTasksUpdat
 
       const result = await response.json();
 
-      if (response.ok) {
-        alert(result.message || `Успешно импортировано ${result.imported} задач`);
+      if (!response.ok) {
+        alert('Ошибка: ' + (result.error || result.detail || 'Неизвестная ошибка'));
+        return;
+      }
+
+      const job = await waitForImportJob(result.id);
+
+      if (job.status === 'completed') {
+        alert(job.message || `Успешно импортировано ${job.tasks_imported} задач`);
         if (onTasksUpdated) {
           onTasksUpdated();
         }
       } else {
-        alert('Ошибка: ' + (result.error || 'Неизвестная ошибка'));
+        alert('Ошибка импорта: ' + (job.error || 'Неизвестная ошибка'));
       }
     } catch (error) {
       alert('Ошибка загрузки файла: ' + (error as Error).message);
     } finally {
       setIsImporting(false);
+      setImportProgress(null);
       // Reset file input
       if (fileInputRef.current) {
         fileInputRef.current.value = '';
@@ -97,7 +140,9 @@ const RecentTasksTable: React.FC<RecentTasksTableProps> = ({ tasks, onTasksUpdat
           }}
         >
           <span>📥</span>
-          {isImporting ? 'Импорт...' : 'Импорт из CSV'}
+          {isImporting
+            ? `Импорт...${importProgress !== null ? ` ${Math.round(importProgress * 100)}%` : ''}`
+            : 'Импорт из CSV'}
         </button>
       </div>
       <div className="table-wrapper">
@@ -7,6 +7,8 @@ import TaskForm from '../components/TaskForm';
 import ChartsSection from '../components/ChartsSection';
 import RecentTasksTable from '../components/RecentTasksTable';
 
+const RECENT_TASKS_LIMIT = 100;
+
 const Dashboard = () => {
   const { user, logout, token } = useAuth();
   const [currentYear, setCurrentYear] = useState(new Date().getFullYear());
@@ -25,7 +27,7 @@ const Dashboard = () => {
 
     try {
       // Fetch month stats
-      const monthRes = await fetch(`/api/month/stats/${currentYear}/${currentMonth}`, { headers });
+      const monthRes = await fetch(`/api/month/stats/${currentYear}/${currentMonth}?include_tasks=false`, { headers });
       const monthData = await monthRes.json();
       setMonthStats(monthData);
 
@@ -34,14 +36,14 @@ const Dashboard = () => {
       const dailyData = await dailyRes.json();
       setDailyStats(Array.isArray(dailyData) ? dailyData : []);
 
-      // Fetch difficulty stats (all tasks)
-      const tasksRes = await fetch('/api/tasks', { headers });
+      // Fetch recent tasks (first page, only the columns the table shows)
+      const tasksRes = await fetch(`/api/tasks?limit=${RECENT_TASKS_LIMIT}&fields=problem_id,title,difficulty,points,notes`, { headers });
       const tasksData = await tasksRes.json();
       setDifficultyStats(tasksData);
-      setRecentTasks(tasksData); // Assuming /api/tasks returns all tasks, we might want to limit this or use a different endpoint for recent tasks
+      setRecentTasks(tasksData);
 
       // Fetch time stats
-      const timeRes = await fetch('/api/stats/time', { headers });
+      const timeRes = await fetch('/api/stats/time?include_tasks=false', { headers });
       const timeData = await timeRes.json();
       setTimeStats(timeData);
 
@@ -12,7 +12,7 @@ from sqlalchemy.orm import Session
 
 from . import models
 from .config import settings
-from .database import get_db
+from .database import AsyncDBSession, get_async_db, get_db
 
 
 # Configure logging
@@ -114,21 +114,12 @@ def get_current_user_optional(request: Request, db: Session = Depends(get_db)) -
     return user
 
 
-def get_current_user(request: Request, db: Session = Depends(get_db)) -> models.User:
+def _decode_user_id(token: str) -> int:
     """
-    Получить текущего пользователя из токена (обязательно).
+    Decode a JWT and return the user id it was issued for.
 
-    Raises HTTPException если пользователь не авторизован.
+    Raises HTTPException (401) if the token is invalid.
     """
-    token = _get_token_from_request(request)
-    if not token:
-        logger.warning(f"Authentication failed: No token found. Cookies: {request.cookies.keys()}")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
         user_id_str = payload.get("sub")
@@ -156,7 +147,54 @@ def get_current_user(request: Request, db: Session = Depends(get_db)) -> models.
             headers={"WWW-Authenticate": "Bearer"},
         ) from e
 
+    return user_id
+
+
+def get_current_user(request: Request, db: Session = Depends(get_db)) -> models.User:
+    """
+    Получить текущего пользователя из токена (обязательно).
+
+    Raises HTTPException если пользователь не авторизован.
+    """
+    token = _get_token_from_request(request)
+    if not token:
+        logger.warning(f"Authentication failed: No token found. Cookies: {request.cookies.keys()}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    user_id = _decode_user_id(token)
+
     user = db.query(models.User).filter(models.User.id == user_id).first()
+    return _require_user(user, user_id)
+
+
+async def get_current_user_async(request: Request, db: AsyncDBSession = Depends(get_async_db)) -> models.User:
+    """
+    Получить текущего пользователя из токена (обязательно) для async-роутов.
+
+    Пользователь привязан к сессии ``get_async_db`` этого запроса.
+    Raises HTTPException если пользователь не авторизован.
+    """
+    token = _get_token_from_request(request)
+    if not token:
+        logger.warning(f"Authentication failed: No token found. Cookies: {request.cookies.keys()}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    user_id = _decode_user_id(token)
+
+    user = await db.get(models.User, user_id)
+    return _require_user(user, user_id)
+
+
+def _require_user(user: models.User | None, user_id: int) -> models.User:
+    """Return the user or raise HTTPException (401) if it does not exist."""
     if user is None:
         logger.warning(f"Authentication failed: User {user_id} not found")
         raise HTTPException(
@@ -168,6 +206,20 @@ def get_current_user(request: Request, db: Session = Depends(get_db)) -> models.
     return user
 
 
+def get_current_admin(current_user: models.User = Depends(get_current_user)) -> models.User:
+    """
+    Получить текущего пользователя, если он администратор (``admin_user_ids`` в настройках).
+
+    Raises HTTPException (403) для остальных пользователей.
+    """
+    admin_ids = {int(user_id) for user_id in settings.admin_user_ids.split(",") if user_id.strip()}
+    if current_user.id not in admin_ids:
+        logger.warning(f"Admin access denied for user {current_user.id}")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+
+    return current_user
+
+
 def get_or_create_user(
     oauth_provider: str, oauth_id: str, email: str | None, username: str, avatar_url: str | None, db: Session
 ) -> models.User:
@@ -9,30 +9,51 @@ import contextlib
 from datetime import datetime, timezone
 from functools import lru_cache
 import logging
-
-from sqlalchemy.orm import Session
+from typing import Any
 
 from .config import settings
-from .database import SessionLocal
+from .database import SessionLocal, run_in_db_executor
 from .leetcode_client import get_leetcode_client
-from .models import SolvedTask, User
+from .models import User
+from .problem_catalog import get_problem_catalog
+from .stats_cache import invalidate_user_stats
+from .task_sync import save_submissions
 
 
 logger = logging.getLogger(__name__)
 
+# Idle users (nothing new fetched) get last_synced_at rewritten at most this often instead of every cycle
+LAST_SYNCED_REFRESH_INTERVAL = 15 * 60  # seconds
+
+# Loaded once per cycle to decide, without touching the DB again, which users have changes
+SYNC_USER_COLUMNS = (
+    User.id,
+    User.leetcode_username,
+    User.last_submission_timestamp,
+    User.last_synced_at,
+    User.ranking,
+    User.reputation,
+    User.total_solved,
+    User.easy_solved,
+    User.medium_solved,
+    User.hard_solved,
+)
+
 
 class LeetCodeSyncService:
     """Background service for continuous LeetCode synchronization."""
 
-    def __init__(self, sync_interval: int = 10) -> None:
+    def __init__(self, sync_interval: int = 10, concurrency: int = 1) -> None:
         """
         Initialize sync service.
 
         Args:
             sync_interval: Interval in seconds between syncs (default: 10)
+            concurrency: Maximum number of users synced at the same time (default: 1)
 
         """
         self.sync_interval = sync_interval
+        self.concurrency = max(concurrency, 1)
         self.is_running = False
         self._task = None
 
@@ -62,6 +83,7 @@ class LeetCodeSyncService:
         """Run the main sync loop."""
         while self.is_running:
             try:
+                await self._refresh_problem_catalog()
                 await self._sync_all_users()
             except Exception as e:
                 logger.error(f"Error in sync loop: {e}", exc_info=True)
@@ -69,148 +91,199 @@ class LeetCodeSyncService:
             # Wait for next sync interval
             await asyncio.sleep(self.sync_interval)
 
+    async def _refresh_problem_catalog(self) -> None:
+        """Re-fetch the problem catalog from LeetCode when it is stale."""
+        catalog = get_problem_catalog()
+        if not catalog.is_stale:
+            return
+
+        try:
+            await catalog.refresh(get_leetcode_client())
+        except Exception as e:
+            logger.error(f"Error refreshing problem catalog: {e}")
+
     async def _sync_all_users(self) -> None:
         """Sync LeetCode data for all users with leetcode_username set."""
-        db = SessionLocal()
-        try:
-            # Get all users with LeetCode username
-            users = db.query(User).filter(User.leetcode_username.isnot(None)).all()
+        users = await run_in_db_executor(_load_sync_users)
+
+        if not users:
+            logger.debug("No users with LeetCode username to sync")
+            return
 
-            if not users:
-                logger.debug("No users with LeetCode username to sync")
+        logger.info(f"Syncing {len(users)} users (concurrency: {self.concurrency})...")
+
+        # Profile, solved stats and submissions for all users in a few batched requests
+        client = get_leetcode_client()
+        sync_data = await client.get_users_sync_data(
+            [user["leetcode_username"] for user in users],
+            submissions_limit=20,
+            batch_size=settings.leetcode_sync_batch_size,
+            concurrency=self.concurrency,
+        )
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        idle_count = 0
+
+        async def sync_one(user: dict[str, Any]) -> None:
+            nonlocal idle_count
+            user_data = sync_data.get(user["leetcode_username"])
+            if user_data is None:
+                logger.warning(f"No sync data fetched for user {user['id']} ({user['leetcode_username']}), skipping")
                 return
 
-            logger.info(f"Syncing {len(users)} users...")
+            # Nothing new for this user: no session, no queries, no commit
+            if _is_idle(user, user_data):
+                idle_count += 1
+                return
 
-            for user in users:
-                try:
-                    await self._sync_user(user, db)
-                except Exception as e:
-                    logger.error(f"Error syncing user {user.id} ({user.leetcode_username}): {e}")
-                    continue
+            async with semaphore:
+                await self._sync_user_isolated(user["id"], user_data)
 
-            logger.info(f"✅ Sync completed for {len(users)} users")
+        await asyncio.gather(*(sync_one(user) for user in users))
 
-        finally:
-            db.close()
+        logger.info(f"✅ Sync completed for {len(users)} users ({idle_count} without changes)")
 
-    async def _sync_user(self, user: User, db: Session) -> None:
+    async def _sync_user_isolated(self, user_id: int, sync_data: dict[str, Any]) -> None:
         """
-        Sync LeetCode data for a single user.
+        Sync a single user, containing any error.
 
         Args:
-            user: User object
-            db: Database session
+            user_id: User ID
+            sync_data: Prefetched LeetCode data for the user
 
         """
-        if not user.leetcode_username:
-            return
+        try:
+            submissions = sync_data.get("submissions") or []
+            difficulties = await get_problem_catalog().get_difficulties(
+                get_leetcode_client(), {submission["titleSlug"] for submission in submissions}
+            )
+            # Queries and commits run in the DB executor, off the event loop
+            await run_in_db_executor(self._sync_user, user_id, sync_data, difficulties)
+        except Exception as e:
+            logger.error(f"Error syncing user {user_id}: {e}")
+
+    def _sync_user(self, user_id: int, sync_data: dict[str, Any], difficulties: dict[str, str]) -> None:
+        """
+        Apply LeetCode data for a single user in its own DB session.
+
+        Blocking, run it in the DB executor.
+
+        Args:
+            user_id: User ID
+            sync_data: Prefetched ``{"profile", "solved", "submissions"}`` for the user
+            difficulties: Problem slug to difficulty mapping for the submissions
 
+        """
+        db = SessionLocal()
         try:
-            client = get_leetcode_client()
+            user = db.get(User, user_id)
+            if user is None or not user.leetcode_username:
+                return
 
-            # 1. Fetch User Profile & Stats
+            # 1. Apply User Profile & Stats
             try:
-                profile = await client.get_user_profile(user.leetcode_username)
-                solved_stats = await client.get_user_solved_problems(user.leetcode_username)
-
-                if profile and profile.get("profile"):
-                    user_profile = profile["profile"]
-                    user.ranking = user_profile.get("ranking")
-                    user.reputation = user_profile.get("reputation")
-                
-                if solved_stats:
-                    user.total_solved = solved_stats.get("solvedProblem")
-                    user.easy_solved = solved_stats.get("easySolved")
-                    user.medium_solved = solved_stats.get("mediumSolved")
-                    user.hard_solved = solved_stats.get("hardSolved")
-                
+                for field, value in _profile_stats(sync_data).items():
+                    setattr(user, field, value)
+
                 user.last_synced_at = datetime.now(timezone.utc)
                 db.add(user)
-                
+
             except Exception as e:
-                logger.error(f"Error fetching profile stats for {user.leetcode_username}: {e}")
+                logger.error(f"Error applying profile stats for {user.leetcode_username}: {e}")
 
-            # 2. Fetch recent accepted submissions (last 20 to avoid rate limits)
-            submissions = await client.get_recent_ac_submissions(user.leetcode_username, limit=20)
+            # 2. Recent accepted submissions (last 20 to avoid rate limits) newer than the watermark
+            watermark = user.last_submission_timestamp or 0
+            submissions = [
+                submission
+                for submission in sync_data.get("submissions") or []
+                if int(submission["timestamp"]) > watermark
+            ]
 
             if not submissions:
-                logger.debug(f"No submissions found for {user.leetcode_username}")
+                logger.debug(f"No new submissions for {user.leetcode_username}")
                 db.commit() # Commit profile stats even if no new submissions
                 return
 
-            synced_count = 0
-            problem_difficulties = {}
-
-            for submission in submissions:
-                try:
-                    # Convert timestamp to date
-                    submission_date = datetime.fromtimestamp(int(submission["timestamp"]), tz=timezone.utc).date()
-                    title = submission["title"]
-                    title_slug = submission["titleSlug"]
-
-                    # Check if this task already exists
-                    existing = (
-                        db.query(SolvedTask)
-                        .filter(
-                            SolvedTask.user_id == user.id, SolvedTask.title == title, SolvedTask.date == submission_date
-                        )
-                        .first()
-                    )
-
-                    if existing:
-                        continue
-
-                    # Get difficulty for this problem (cache it)
-                    if title_slug not in problem_difficulties:
-                        try:
-                            problem_details = await client.get_problem_details(title_slug)
-                            difficulty = problem_details.get("difficulty", "Medium")
-                            problem_difficulties[title_slug] = difficulty
-                        except Exception as e:
-                            logger.warning(f"Could not fetch difficulty for {title_slug}: {e}")
-                            difficulty = "Medium"
-                            problem_difficulties[title_slug] = difficulty
-                    else:
-                        difficulty = problem_difficulties[title_slug]
-
-                    # Calculate XP
-                    xp_map = {"Easy": 1, "Medium": 3, "Hard": 5}
-                    points = xp_map.get(difficulty, 3)
-
-                    # Create new task
-                    task = SolvedTask(
-                        user_id=user.id,
-                        date=submission_date,
-                        title=title,
-                        problem_id=submission.get("id"),
-                        difficulty=difficulty,
-                        points=points,
-                        platform="leetcode",
-                        notes=f"Auto-synced from LeetCode (Language: {submission.get('lang', 'Unknown')})",
-                    )
-
-                    db.add(task)
-                    synced_count += 1
-
-                except Exception as e:
-                    logger.error(f"Error processing submission {submission.get('title')}: {e}")
-                    continue
+            synced_count = save_submissions(db, user.id, submissions, difficulties, note="Auto-synced from LeetCode")
 
+            # Commit new tasks together with the profile stats and the advanced watermark
+            user.last_submission_timestamp = max(int(submission["timestamp"]) for submission in submissions)
+            db.commit()
             if synced_count > 0:
-                db.commit()
+                invalidate_user_stats(user.id)
                 logger.info(f"✅ Synced {synced_count} new tasks for user {user.leetcode_username}")
 
         except Exception as e:
-            logger.error(f"Error syncing user {user.leetcode_username}: {e}")
+            logger.error(f"Error syncing user {user_id}: {e}")
             db.rollback()
             raise
+        finally:
+            db.close()
+
+
+def _profile_stats(sync_data: dict[str, Any]) -> dict[str, Any]:
+    """Map fetched profile and solved stats to ``User`` columns (only the sections that were fetched)."""
+    stats: dict[str, Any] = {}
+
+    profile = sync_data.get("profile")
+    if profile and profile.get("profile"):
+        user_profile = profile["profile"]
+        stats["ranking"] = user_profile.get("ranking")
+        stats["reputation"] = user_profile.get("reputation")
+
+    solved_stats = sync_data.get("solved")
+    if solved_stats:
+        stats["total_solved"] = solved_stats.get("solvedProblem")
+        stats["easy_solved"] = solved_stats.get("easySolved")
+        stats["medium_solved"] = solved_stats.get("mediumSolved")
+        stats["hard_solved"] = solved_stats.get("hardSolved")
+
+    return stats
+
+
+def _is_idle(user: dict[str, Any], sync_data: dict[str, Any]) -> bool:
+    """
+    Whether syncing the user would change nothing worth a DB round trip.
+
+    True when no fetched submission is newer than the watermark, the profile
+    stats are unchanged and ``last_synced_at`` was refreshed recently.
+
+    Args:
+        user: Row loaded by ``_load_sync_users``
+        sync_data: Prefetched LeetCode data for the user
+
+    """
+    watermark = user["last_submission_timestamp"] or 0
+    if any(int(submission["timestamp"]) > watermark for submission in sync_data.get("submissions") or []):
+        return False
+
+    if any(user[field] != value for field, value in _profile_stats(sync_data).items()):
+        return False
+
+    synced_at = user["last_synced_at"]
+    if synced_at is None:
+        return False
+    if synced_at.tzinfo is None:  # SQLite returns naive UTC values
+        synced_at = synced_at.replace(tzinfo=timezone.utc)
+    return (datetime.now(timezone.utc) - synced_at).total_seconds() < LAST_SYNCED_REFRESH_INTERVAL
+
+
+def _load_sync_users() -> list[dict[str, Any]]:
+    """Return the sync state of every user with a LeetCode username (blocking)."""
+    db = SessionLocal()
+    try:
+        rows = db.query(*SYNC_USER_COLUMNS).filter(User.leetcode_username.isnot(None))
+        return [row._asdict() for row in rows]
+    finally:
+        db.close()
 
 
 @lru_cache(maxsize=1)
 def get_sync_service() -> LeetCodeSyncService:
     """Get or create the global sync service instance."""
-    return LeetCodeSyncService(sync_interval=settings.leetcode_sync_interval)
+    return LeetCodeSyncService(
+        sync_interval=settings.leetcode_sync_interval, concurrency=settings.leetcode_sync_concurrency
+    )
 
 
 async def start_sync_service() -> None:
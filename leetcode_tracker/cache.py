@@ -0,0 +1,77 @@
+"""In-process caching primitives."""
+
+from collections import OrderedDict
+from collections.abc import Hashable
+import time
+from typing import Any
+
+
+class TTLCache:
+    """Bounded LRU cache with a per-entry time to live."""
+
+    def __init__(self, max_size: int = 1024) -> None:
+        """
+        Initialize cache.
+
+        Args:
+            max_size: Maximum number of entries before the least recently used one is evicted
+
+        """
+        self.max_size = max(max_size, 1)
+        self._entries: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.stale_hits = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached value for ``key``, or None if it is missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def get_stale(self, key: Hashable) -> Any | None:
+        """
+        Return the value for ``key`` even if it has expired.
+
+        Expired entries are kept until evicted or overwritten so they can be
+        served as a fallback while the upstream is unavailable.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        self.stale_hits += 1
+        return entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """Store ``value`` under ``key`` for ``ttl`` seconds."""
+        if ttl <= 0:
+            return
+
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return cache counters."""
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "stale_hits": self.stale_hits,
+        }
@@ -27,12 +27,42 @@ class Settings(BaseSettings):
     app_title: str = "LeetCode Tracker"
     debug: bool = False
 
+    # Users allowed to call admin endpoints (whole-database export), comma-separated user ids
+    admin_user_ids: str = ""
+
     # Logging
     log_level: str = "INFO"
 
     # LeetCode Auto-Sync
     leetcode_sync_enabled: bool = True
     leetcode_sync_interval: int = 10  # seconds
+    leetcode_sync_batch_size: int = 25  # users per batched GraphQL request
+    leetcode_sync_concurrency: int = 5  # users synced in parallel per cycle
+
+    # LeetCode API client
+    leetcode_cache_size: int = 1024  # cached GraphQL responses (LRU)
+    leetcode_rate_limit: float = 5.0  # outbound requests per second, 0 disables
+    leetcode_rate_burst: int = 10
+    leetcode_max_retries: int = 3  # retries on 429/5xx with exponential backoff
+    leetcode_circuit_failure_threshold: int = 5  # consecutive failures before failing fast
+    leetcode_circuit_recovery_timeout: float = 30.0  # seconds before a probe request
+    leetcode_max_connections: int = 20
+    leetcode_max_keepalive_connections: int = 10
+    leetcode_http2: bool = False  # requires the 'http2' extra (h2)
+    leetcode_connect_timeout: float = 5.0  # seconds
+    leetcode_read_timeout: float = 10.0  # seconds, lightweight queries
+    leetcode_heavy_read_timeout: float = 30.0  # seconds, problem details / lists / sync batches
+
+    # CSV import
+    csv_import_batch_size: int = 1000  # task rows per bulk insert
+    import_jobs_dir: str = "./data/imports"  # uploads of background import jobs, kept until the job finishes
+    import_jobs_concurrency: int = 1  # background import jobs processed at the same time
+
+    # Stats cache (dashboard endpoints)
+    stats_cache_enabled: bool = True
+    stats_cache_size: int = 1024  # cached responses (LRU, in-process backend)
+    stats_cache_ttl: int = 300  # seconds, entries are also invalidated by task writes
+    stats_cache_redis_url: str | None = None  # e.g. redis://redis:6379/0, requires the 'redis' extra
 
     model_config = SettingsConfigDict(
         env_file=".env",
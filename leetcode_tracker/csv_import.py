@@ -0,0 +1,218 @@
+"""
+Streaming CSV Task Import.
+
+Reads an uploaded CSV incrementally (encoding detected from a prefix), turns
+rows into ``solved_tasks`` rows and inserts them in executemany batches, so
+memory stays bounded by the batch size rather than the file size.
+
+Two row formats are accepted:
+
+- aggregate: ``date,easy,medium,hard[,title]`` - counts of tasks per difficulty
+- individual: ``date,difficulty[,points,title,problem_id,notes,time_spent,platform,title_slug]`` -
+  one task per row, the columns of the CSV export
+"""
+
+import codecs
+from collections.abc import Iterator
+import csv
+from datetime import date
+import io
+import logging
+from typing import Any, BinaryIO
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from .daily_stats import add_to_daily_stats, refresh_daily_stats
+from .models import SolvedTask
+from .task_sync import calculate_xp, insert_new_tasks
+
+
+logger = logging.getLogger(__name__)
+
+# Bytes inspected to pick the encoding
+ENCODING_PREFIX_SIZE = 64 * 1024
+# Tried in order on the prefix; latin-1 decodes anything and is the last resort
+ENCODINGS = ("utf-8", "cp1251", "iso-8859-1")
+# Row errors kept for the response, the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+AGGREGATE_COLUMNS = ("Easy", "Medium", "Hard")
+DEFAULT_NOTE = "Imported from CSV"
+DEFAULT_PLATFORM = "leetcode"
+
+
+def detect_encoding(prefix: bytes) -> str:
+    """
+    Pick the encoding of a file from its first bytes.
+
+    The prefix is decoded incrementally so a multi-byte character cut at the
+    end of it does not count as an error.
+    """
+    if prefix.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+
+    for encoding in ENCODINGS:
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(prefix, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            logger.debug(f"CSV prefix is not {encoding}")
+    return ENCODINGS[-1]
+
+
+def open_csv_text(binary: BinaryIO) -> io.TextIOWrapper:
+    """
+    Wrap a binary upload stream as text in its detected encoding.
+
+    Undecodable bytes further in the file are replaced rather than failing the import.
+    """
+    encoding = detect_encoding(binary.read(ENCODING_PREFIX_SIZE))
+    binary.seek(0)
+    logger.info(f"Decoding CSV as {encoding}")
+    return io.TextIOWrapper(binary, encoding=encoding, errors="replace", newline="")
+
+
+def parse_row(row: dict[str, str], user_id: int) -> list[dict[str, Any]]:
+    """
+    Turn one CSV row into task rows.
+
+    Raises ValueError/KeyError on invalid rows.
+    """
+    task_date = date.fromisoformat(row["date"])
+
+    # Aggregate format (easy/medium/hard columns)
+    if "easy" in row or "medium" in row or "hard" in row:
+        tasks = []
+        for difficulty in AGGREGATE_COLUMNS:
+            count = int(row.get(difficulty.lower(), 0) or 0)
+            points = calculate_xp(difficulty)
+            tasks.extend(
+                {
+                    "user_id": user_id,
+                    "date": task_date,
+                    "difficulty": difficulty,
+                    "points": points,
+                    "title": row["title"] if "title" in row else f"Imported {difficulty} task {i + 1}",
+                    "notes": DEFAULT_NOTE,
+                }
+                for i in range(count)
+            )
+        return tasks
+
+    # Individual task format
+    difficulty = row.get("difficulty", "Medium")
+    points = int(row["points"]) if row.get("points") else calculate_xp(difficulty)
+    return [
+        {
+            "user_id": user_id,
+            "date": task_date,
+            "difficulty": difficulty,
+            "points": points,
+            "title": row.get("title") or None,
+            "problem_id": row.get("problem_id") or None,
+            "notes": row.get("notes") or DEFAULT_NOTE,
+            "time_spent": int(row["time_spent"]) if row.get("time_spent") else None,
+            "platform": row.get("platform") or DEFAULT_PLATFORM,
+            # Exported LeetCode tasks keep their sync identity
+            "title_slug": row.get("title_slug") or None,
+        }
+    ]
+
+
+def iter_task_batches(
+    binary: BinaryIO, user_id: int, batch_size: int, start_row: int = 1
+) -> Iterator[tuple[int, list[dict[str, Any]], list[str]]]:
+    """
+    Parse a CSV upload into batches of task rows.
+
+    Args:
+        binary: Upload stream, read incrementally
+        user_id: Owner of the tasks
+        batch_size: Minimum task rows per batch (a row's tasks are never split)
+        start_row: Skip CSV rows up to and including this line number (resume point)
+
+    Returns:
+        Iterator of ``(last_row, tasks, errors)``: the last CSV line number consumed,
+        the task rows and the row errors of the batch
+
+    """
+    reader = csv.DictReader(open_csv_text(binary))
+    if reader.fieldnames:
+        logger.info(f"CSV headers: {reader.fieldnames}")
+
+    tasks: list[dict[str, Any]] = []
+    errors: list[str] = []
+    row_num = 1
+    # Line numbers count the header as line 1, like spreadsheet editors
+    for row_num, row in enumerate(reader, start=2):
+        if row_num <= start_row:
+            continue
+
+        try:
+            tasks.extend(parse_row(row, user_id))
+        except Exception as e:
+            errors.append(f"Строка {row_num}: {e!s}")
+            logger.debug(f"Error processing row {row_num}: {e!s}")
+
+        if len(tasks) >= batch_size:
+            yield row_num, tasks, errors
+            tasks, errors = [], []
+
+    if tasks or errors:
+        yield row_num, tasks, errors
+
+
+def insert_tasks(db: Session, user_id: int, tasks: list[dict[str, Any]]) -> int:
+    """
+    Bulk insert task rows (executemany) and add them to the daily stats rollup. The caller commits.
+
+    Tasks with a ``title_slug`` that is already stored for their day (a re-imported
+    export, or a task the sync created) are skipped, and their days recomputed
+    instead of incremented.
+
+    Returns:
+        Number of tasks inserted
+
+    """
+    if not tasks:
+        return 0
+
+    if any(task.get("title_slug") for task in tasks):
+        inserted = insert_new_tasks(db, tasks)
+        refresh_daily_stats(db, user_id, {task["date"] for task in tasks})
+        return inserted
+
+    db.execute(insert(SolvedTask), tasks)
+    add_to_daily_stats(db, user_id, tasks)
+    return len(tasks)
+
+
+def import_csv(db: Session, binary: BinaryIO, user_id: int, batch_size: int) -> dict[str, Any]:
+    """
+    Import a CSV upload in one transaction (blocking, run it in the DB executor).
+
+    Args:
+        db: Database session
+        binary: Upload stream
+        user_id: Owner of the tasks
+        batch_size: Task rows per bulk insert
+
+    Returns:
+        ``{"imported", "error_count", "errors"}`` with at most MAX_REPORTED_ERRORS error messages
+
+    """
+    imported = 0
+    error_count = 0
+    errors: list[str] = []
+    try:
+        for _, tasks, batch_errors in iter_task_batches(binary, user_id, batch_size):
+            imported += insert_tasks(db, user_id, tasks)
+            error_count += len(batch_errors)
+            errors.extend(batch_errors[: MAX_REPORTED_ERRORS - len(errors)])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return {"imported": imported, "error_count": error_count, "errors": errors}
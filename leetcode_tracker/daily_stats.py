@@ -0,0 +1,180 @@
+"""
+Daily Stats Rollup.
+
+Keeps ``user_daily_stats`` in sync with ``solved_tasks``: every writer calls
+``refresh_daily_stats`` for the days it touched, in the same transaction, and
+the stats endpoints read O(days) rollup rows instead of O(tasks) task rows.
+"""
+
+from collections.abc import Iterable
+from datetime import date
+import logging
+from typing import Any
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from .models import SolvedTask, User, UserDailyStat
+
+
+logger = logging.getLogger(__name__)
+
+# Days recomputed per statement, keeps IN lists well below driver parameter limits
+REFRESH_CHUNK_SIZE = 500
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE, used for incremental updates
+UPSERT_DIALECTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+ROLLUP_COLUMNS = ("user_id", "date", "difficulty", "tasks_count", "xp_sum", "time_spent_sum", "timed_count")
+
+
+def _aggregate_tasks():
+    """Select solved_tasks aggregated into rollup rows (one per user, day and difficulty)."""
+    return select(
+        SolvedTask.user_id,
+        SolvedTask.date,
+        SolvedTask.difficulty,
+        func.count(),
+        func.sum(SolvedTask.points),
+        func.coalesce(func.sum(SolvedTask.time_spent), 0),
+        func.count(SolvedTask.time_spent),
+    ).group_by(SolvedTask.user_id, SolvedTask.date, SolvedTask.difficulty)
+
+
+def _lock_user_rollup(db: Session, user_id: int) -> None:
+    """
+    Serialize rollup writers of one user until the transaction ends.
+
+    Locks the user's row (``SELECT ... FOR NO KEY UPDATE``). Without it, two
+    writers on PostgreSQL (READ COMMITTED) can both delete a day's rows and
+    re-insert them, and the second insert fails on the primary key. After taking
+    the lock, each statement sees every task committed by the previous writer.
+
+    Writers insert their tasks before locking, and each insert holds
+    ``FOR KEY SHARE`` on the user row for its foreign key check. A plain
+    ``FOR UPDATE`` conflicts with that lock, so two writers would deadlock;
+    ``FOR NO KEY UPDATE`` only conflicts with itself. SQLite already serializes
+    writers and ignores the clause.
+    """
+    db.execute(select(User.id).where(User.id == user_id).with_for_update(key_share=True))
+
+
+def refresh_daily_stats(db: Session, user_id: int, dates: Iterable[date]) -> None:
+    """
+    Recompute the rollup rows of a user's days from solved_tasks.
+
+    Pending changes are flushed first, so call it after adding, editing or
+    deleting tasks and before the commit. The caller commits.
+
+    Args:
+        db: Database session
+        user_id: Owner of the tasks
+        dates: Days whose tasks changed (old and new day for a moved task)
+
+    """
+    days = sorted(set(dates))
+    if not days:
+        return
+
+    db.flush()
+    _lock_user_rollup(db, user_id)
+    for start in range(0, len(days), REFRESH_CHUNK_SIZE):
+        chunk = days[start : start + REFRESH_CHUNK_SIZE]
+        db.execute(delete(UserDailyStat).where(UserDailyStat.user_id == user_id, UserDailyStat.date.in_(chunk)))
+        db.execute(
+            insert(UserDailyStat).from_select(
+                ROLLUP_COLUMNS,
+                _aggregate_tasks().where(SolvedTask.user_id == user_id, SolvedTask.date.in_(chunk)),
+            )
+        )
+
+
+def add_to_daily_stats(db: Session, user_id: int, tasks: list[dict[str, Any]]) -> None:
+    """
+    Add newly inserted task rows to the rollup without rescanning their days.
+
+    For insert-only writers (bulk imports): the batch is aggregated in memory
+    and upserted as increments, so the cost is O(batch) however many tasks the
+    days already hold. Falls back to ``refresh_daily_stats`` on dialects
+    without an upsert. The caller commits.
+
+    Args:
+        db: Database session
+        user_id: Owner of the tasks
+        tasks: Inserted rows (``date``, ``difficulty``, ``points``, optional ``time_spent``)
+
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect not in UPSERT_DIALECTS:
+        refresh_daily_stats(db, user_id, {task["date"] for task in tasks})
+        return
+
+    totals: dict[tuple[date, str], dict[str, Any]] = {}
+    for task in tasks:
+        row = totals.setdefault(
+            (task["date"], task["difficulty"]),
+            {
+                "user_id": user_id,
+                "date": task["date"],
+                "difficulty": task["difficulty"],
+                "tasks_count": 0,
+                "xp_sum": 0,
+                "time_spent_sum": 0,
+                "timed_count": 0,
+            },
+        )
+        row["tasks_count"] += 1
+        row["xp_sum"] += task["points"]
+        if task.get("time_spent") is not None:
+            row["time_spent_sum"] += task["time_spent"]
+            row["timed_count"] += 1
+
+    if not totals:
+        return
+
+    # Increments commute with each other, but not with a concurrent refresh's delete and re-insert
+    _lock_user_rollup(db, user_id)
+    stmt = UPSERT_DIALECTS[dialect](UserDailyStat)
+    counters = ("tasks_count", "xp_sum", "time_spent_sum", "timed_count")
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "date", "difficulty"],
+        set_={column: getattr(UserDailyStat, column) + getattr(stmt.excluded, column) for column in counters},
+    )
+    db.execute(stmt, list(totals.values()))
+
+
+def clear_daily_stats(db: Session, user_id: int) -> None:
+    """Drop all rollup rows of a user (all their tasks were deleted). The caller commits."""
+    _lock_user_rollup(db, user_id)
+    db.execute(delete(UserDailyStat).where(UserDailyStat.user_id == user_id))
+
+
+def rebuild_daily_stats(db: Session, user_id: int | None = None) -> int:
+    """
+    Rebuild the rollup from scratch, for backfills and repairs.
+
+    Args:
+        db: Database session
+        user_id: Only rebuild this user (default: everyone)
+
+    Returns:
+        Number of rollup rows written
+
+    """
+    delete_stmt = delete(UserDailyStat)
+    source = _aggregate_tasks().where(SolvedTask.user_id.isnot(None))
+    if user_id is not None:
+        _lock_user_rollup(db, user_id)
+        delete_stmt = delete_stmt.where(UserDailyStat.user_id == user_id)
+        source = source.where(SolvedTask.user_id == user_id)
+
+    db.execute(delete_stmt)
+    db.execute(insert(UserDailyStat).from_select(ROLLUP_COLUMNS, source))
+
+    query = db.query(func.count()).select_from(UserDailyStat)
+    if user_id is not None:
+        query = query.filter(UserDailyStat.user_id == user_id)
+    count = query.scalar()
+    logger.info(f"Rebuilt daily stats rollup: {count} rows")
+    return count
@@ -1,7 +1,12 @@
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import os
+from typing import Any, TypeVar
 
 from sqlalchemy import create_engine, event
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 
 # Database URL from environment variable
@@ -13,24 +18,56 @@ connect_args = {}
 if DATABASE_URL.startswith("sqlite"):
     connect_args = {"check_same_thread": False}
 
+# Connection pool size (SQLAlchemy's QueuePool defaults)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+
 # Create engine with appropriate settings
 engine = create_engine(
     DATABASE_URL,
     connect_args=connect_args,
     pool_pre_ping=True,  # Enable connection health checks
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
 )
 
+
+def set_sqlite_pragma(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
+
+
 # Enable WAL mode for SQLite (only if using SQLite)
 if DATABASE_URL.startswith("sqlite"):
-    @event.listens_for(engine, "connect")
-    def set_sqlite_pragma(dbapi_connection, connection_record):
-        cursor = dbapi_connection.cursor()
-        cursor.execute("PRAGMA journal_mode=WAL")
-        cursor.close()
+    event.listen(engine, "connect", set_sqlite_pragma)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Dedicated threads for blocking DB work issued from coroutines (e.g. the background sync),
+# so queries and commits never stall the event loop serving HTTP requests
+DB_EXECUTOR_WORKERS = int(os.getenv("DB_EXECUTOR_WORKERS", "4"))
+db_executor = ThreadPoolExecutor(max_workers=DB_EXECUTOR_WORKERS, thread_name_prefix="db")
+
+# Request sessions (ExecutorSession) get their own threads, one per pooled connection, so
+# long-running work on db_executor (sync, CSV imports, import jobs) can't queue requests
+request_db_executor = ThreadPoolExecutor(max_workers=DB_POOL_SIZE + DB_MAX_OVERFLOW, thread_name_prefix="db-request")
+
+T = TypeVar("T")
+
+
+async def run_in_db_executor(func: Callable[..., T], *args: Any) -> T:
+    """Run a blocking DB function in the DB thread pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(db_executor, partial(func, *args))
+
+
+async def run_in_request_db_executor(func: Callable[..., T], *args: Any) -> T:
+    """Run a blocking call of a request's DB session in the request thread pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(request_db_executor, partial(func, *args))
+
 
 def get_db():
     """FastAPI dependency that provides a DB session."""
@@ -39,3 +76,109 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Async engine for request handlers (opt-in, needs the `async` extra: greenlet + aiosqlite/asyncpg)
+USE_ASYNC_DB = os.getenv("USE_ASYNC_DB", "false").lower() in {"1", "true", "yes"}
+
+# Async drivers for the sync URLs the app is configured with
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg", "postgres": "postgresql+asyncpg"}
+
+
+def _async_database_url(url: str) -> str:
+    """Swap the driver of a sync database URL for its async counterpart."""
+    scheme, sep, rest = url.partition("://")
+    dialect = scheme.split("+", 1)[0]
+    if not sep or dialect not in ASYNC_DRIVERS:
+        return url
+    return f"{ASYNC_DRIVERS[dialect]}://{rest}"
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _async_database_url(DATABASE_URL)
+
+async_engine = None
+AsyncSessionLocal = None
+if USE_ASYNC_DB:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, pool_pre_ping=True)
+    if DATABASE_URL.startswith("sqlite"):
+        event.listen(async_engine.sync_engine, "connect", set_sqlite_pragma)
+
+    # Objects stay usable after commit: expired attributes can't lazy-load in async code
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+# Session yielded by get_async_db: AsyncSession (USE_ASYNC_DB) or ExecutorSession; the asyncio
+# extension can't be imported without greenlet, so it isn't referenced at runtime
+AsyncDBSession = Any
+
+
+class ExecutorSession:
+    """
+    Awaitable facade over a sync Session whose calls run in the request DB executor.
+
+    Exposes the subset of the AsyncSession API the routes use, so they work unchanged
+    whether or not the async engine is enabled.
+    """
+
+    def __init__(self, session: Session) -> None:
+        """
+        Wrap a sync session.
+
+        Args:
+            session: Session owned by this facade (closed by ``close``)
+
+        """
+        self.sync_session = session
+
+    def add(self, instance: Any) -> None:
+        self.sync_session.add(instance)
+
+    async def execute(self, statement: Any, params: Any = None) -> Any:
+        return await run_in_request_db_executor(self._execute_buffered, statement, params)
+
+    def _execute_buffered(self, statement: Any, params: Any) -> Any:
+        """Execute and fetch all rows in the DB thread, like AsyncSession's buffered results."""
+        result = self.sync_session.execute(statement, params)
+        if not getattr(result, "returns_rows", True):
+            return result
+        return result.freeze()()
+
+    async def scalar(self, statement: Any, params: Any = None) -> Any:
+        return await run_in_request_db_executor(self.sync_session.scalar, statement, params)
+
+    async def get(self, entity: Any, ident: Any) -> Any:
+        return await run_in_request_db_executor(self.sync_session.get, entity, ident)
+
+    async def refresh(self, instance: Any) -> None:
+        await run_in_request_db_executor(self.sync_session.refresh, instance)
+
+    async def commit(self) -> None:
+        await run_in_request_db_executor(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await run_in_request_db_executor(self.sync_session.rollback)
+
+    async def close(self) -> None:
+        await run_in_request_db_executor(self.sync_session.close)
+
+
+async def get_async_db():
+    """
+    FastAPI dependency that provides a DB session for async routes.
+
+    Yields an ``AsyncSession`` when ``USE_ASYNC_DB`` is enabled, otherwise an
+    ``ExecutorSession`` running the sync session in the request DB executor. Either way
+    the event loop never blocks on the database.
+    """
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+
+    db = ExecutorSession(SessionLocal(expire_on_commit=False))
+    try:
+        yield db
+    finally:
+        await db.close()
@@ -1,6 +1,14 @@
-from .auth import get_current_user, get_current_user_optional
-from .database import get_db
+from .auth import get_current_admin, get_current_user, get_current_user_async, get_current_user_optional
+from .database import AsyncDBSession, get_async_db, get_db
 
 
 # Re-export dependencies for convenience
-__all__ = ["get_current_user", "get_current_user_optional", "get_db"]
+__all__ = [
+    "AsyncDBSession",
+    "get_async_db",
+    "get_current_admin",
+    "get_current_user",
+    "get_current_user_async",
+    "get_current_user_optional",
+    "get_db",
+]
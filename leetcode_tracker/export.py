@@ -0,0 +1,215 @@
+"""
+Streaming Data Export.
+
+Rows are read in ``yield_per`` partitions (a server-side cursor on PostgreSQL)
+from a dedicated session and encoded batch by batch, so memory stays bounded
+by the batch size rather than the table size.
+
+Formats:
+
+- csv: header row, then one row per record; task exports can be re-imported
+- ndjson: one JSON object per line
+- parquet: one row group per batch, requires the optional 'parquet' extra (pyarrow)
+"""
+
+from collections.abc import Callable, Iterator, Sequence
+import csv
+import io
+import json
+import logging
+from typing import Any
+
+from sqlalchemy import Date, DateTime, Integer, Select, select
+from sqlalchemy.sql.elements import ColumnElement
+
+from .database import SessionLocal
+from .models import MonthGoal, SolvedTask, User
+
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional 'parquet' extra
+    pa = None
+    pq = None
+
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched and encoded per chunk (and per Parquet row group)
+EXPORT_BATCH_SIZE = 10_000
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# Exported columns per table, in output order
+EXPORT_COLUMNS = {
+    "solved_tasks": (
+        "id",
+        "user_id",
+        "date",
+        "platform",
+        "problem_id",
+        "title",
+        "title_slug",
+        "difficulty",
+        "points",
+        "time_spent",
+        "notes",
+        "created_at",
+    ),
+    "users": (
+        "id",
+        "email",
+        "username",
+        "oauth_provider",
+        "oauth_id",
+        "avatar_url",
+        "leetcode_username",
+        "created_at",
+    ),
+    "month_goals": ("id", "user_id", "year", "month", "target_xp", "created_at"),
+}
+EXPORT_MODELS = {"solved_tasks": SolvedTask, "users": User, "month_goals": MonthGoal}
+
+Columns = Sequence[ColumnElement]
+Batches = Iterator[list[tuple]]
+
+
+def user_tasks_statement(user_id: int) -> Select:
+    """Select a user's tasks oldest first (served by the (user_id, date) index)."""
+    columns = [getattr(SolvedTask, name) for name in EXPORT_COLUMNS["solved_tasks"]]
+    return select(*columns).where(SolvedTask.user_id == user_id).order_by(SolvedTask.date, SolvedTask.id)
+
+
+def table_statement(table: str) -> Select:
+    """Select every row of an exportable table in primary key order."""
+    model = EXPORT_MODELS[table]
+    return select(*(getattr(model, name) for name in EXPORT_COLUMNS[table])).order_by(model.id)
+
+
+def iter_batches(statement: Select, batch_size: int = EXPORT_BATCH_SIZE) -> Batches:
+    """
+    Execute a statement in a dedicated session and yield its rows in batches.
+
+    The request session may be closed before the body is sent, so the stream
+    opens its own and closes it once exhausted.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(statement.execution_options(yield_per=batch_size))
+        for partition in result.partitions():
+            yield [tuple(row) for row in partition]
+    finally:
+        db.close()
+
+
+def csv_chunks(columns: Columns, batches: Batches) -> Iterator[bytes]:
+    """Encode batches as UTF-8 CSV, one chunk per batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column.name for column in columns])
+    yield buffer.getvalue().encode()
+
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(batch)
+        yield buffer.getvalue().encode()
+
+
+def ndjson_chunks(columns: Columns, batches: Batches) -> Iterator[bytes]:
+    """Encode batches as NDJSON, one chunk per batch."""
+    names = [column.name for column in columns]
+    for batch in batches:
+        lines = (json.dumps(dict(zip(names, row, strict=True)), default=str, ensure_ascii=False) for row in batch)
+        yield ("\n".join(lines) + "\n").encode()
+
+
+def parquet_chunks(columns: Columns, batches: Batches) -> Iterator[bytes]:
+    """Encode batches as a Parquet file, one row group per batch."""
+    if pa is None:
+        raise ImportError("the 'pyarrow' package is required for Parquet export")
+
+    schema = pa.schema([(column.name, _arrow_type(column.type)) for column in columns])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for batch in batches:
+            arrays = [
+                pa.array(values, type=field.type)
+                for values, field in zip(zip(*batch, strict=True), schema, strict=True)
+            ]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def _arrow_type(sql_type: Any) -> Any:
+    """Arrow type for a column's SQLAlchemy type; anything unlisted is exported as a string."""
+    if isinstance(sql_type, DateTime):
+        return pa.timestamp("us", tz="UTC") if sql_type.timezone else pa.timestamp("us")
+    if isinstance(sql_type, Date):
+        return pa.date32()
+    if isinstance(sql_type, Integer):
+        return pa.int64()
+    return pa.string()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands out what was written since the last drain, keeping the absolute position."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+EXPORT_WRITERS: dict[str, Callable[[Columns, Batches], Iterator[bytes]]] = {
+    "csv": csv_chunks,
+    "ndjson": ndjson_chunks,
+    "parquet": parquet_chunks,
+}
+
+
+def export_chunks(statement: Select, export_format: str, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    """
+    Stream the rows of a statement encoded in an export format.
+
+    Args:
+        statement: Select of the exported columns
+        export_format: One of EXPORT_WRITERS
+        batch_size: Rows fetched and encoded per chunk
+
+    Returns:
+        Iterator of encoded chunks
+
+    """
+    logger.info(f"Exporting {export_format} in batches of {batch_size}")
+    return EXPORT_WRITERS[export_format](statement.selected_columns, iter_batches(statement, batch_size))
+
+
+def parquet_available() -> bool:
+    """Whether the optional Parquet writer can be used."""
+    return pa is not None
@@ -0,0 +1,277 @@
+"""
+Background CSV Import Jobs.
+
+Large uploads are persisted to ``import_jobs_dir`` and imported by a worker in
+committed batches instead of inside the request. Each batch commits its tasks
+together with the job's resume point (the last CSV line consumed), so a job
+interrupted by a crash or restart continues from its last committed batch when
+the app starts again.
+"""
+
+import asyncio
+from collections.abc import Callable
+from datetime import datetime, timezone
+from functools import lru_cache
+import logging
+from pathlib import Path
+import shutil
+import threading
+from typing import Any, BinaryIO
+import uuid
+
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .csv_import import MAX_REPORTED_ERRORS, insert_tasks, iter_task_batches
+from .database import SessionLocal, run_in_db_executor
+from .models import ImportJob
+from .stats_cache import invalidate_user_stats
+
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+# Jobs picked up again at startup
+ACTIVE_STATUSES = (PENDING, RUNNING)
+
+# Bytes per read/write when persisting an upload
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def create_import_job(db: Session, user_id: int, filename: str | None, upload: BinaryIO) -> ImportJob:
+    """
+    Persist an upload and register a pending import job for it (blocking).
+
+    Args:
+        db: Database session
+        user_id: Owner of the tasks
+        filename: Original file name, for display
+        upload: Upload stream, copied in chunks
+
+    Returns:
+        The committed job
+
+    """
+    job_id = uuid.uuid4().hex
+    directory = Path(settings.import_jobs_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{job_id}.csv"
+
+    with path.open("wb") as out:
+        shutil.copyfileobj(upload, out, COPY_CHUNK_SIZE)
+
+    job = ImportJob(
+        id=job_id,
+        user_id=user_id,
+        filename=filename,
+        path=str(path),
+        size_bytes=path.stat().st_size,
+        status=PENDING,
+        rows_done=0,
+        bytes_done=0,
+        tasks_imported=0,
+        error_count=0,
+    )
+    db.add(job)
+    try:
+        db.commit()
+    except Exception:
+        db.rollback()
+        path.unlink(missing_ok=True)
+        raise
+
+    logger.info(f"Import job {job_id} created for user {user_id} ({job.size_bytes} bytes)")
+    return job
+
+
+def import_job_progress(job: ImportJob) -> dict[str, Any]:
+    """Serialize a job with its progress and average throughput since it started."""
+    elapsed = None
+    if job.started_at is not None:
+        end = job.finished_at or datetime.now(timezone.utc)
+        elapsed = max((_as_utc(end) - _as_utc(job.started_at)).total_seconds(), 0.0)
+
+    def per_second(count: int) -> float | None:
+        return round(count / elapsed, 1) if elapsed else None
+
+    return {
+        "id": job.id,
+        "status": job.status,
+        "filename": job.filename,
+        "rows_done": job.rows_done,
+        "tasks_imported": job.tasks_imported,
+        "error_count": job.error_count,
+        "errors": job.errors or [],
+        "error": job.error,
+        "size_bytes": job.size_bytes,
+        "bytes_done": job.bytes_done,
+        "progress": round(min(job.bytes_done / job.size_bytes, 1.0), 4) if job.size_bytes else None,
+        "elapsed_seconds": round(elapsed, 1) if elapsed is not None else None,
+        "rows_per_second": per_second(job.rows_done),
+        "tasks_per_second": per_second(job.tasks_imported),
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+def run_import_job(job_id: str, batch_size: int, should_stop: Callable[[], bool]) -> None:
+    """
+    Import a job's file from its resume point (blocking, run it in the DB executor).
+
+    Args:
+        job_id: Job to run, skipped unless pending or running
+        batch_size: Task rows per bulk insert and commit
+        should_stop: Checked after every committed batch; the job stays running and resumes at next startup
+
+    """
+    # The job row is only written here, no need to reload it after every commit
+    db = SessionLocal(expire_on_commit=False)
+    try:
+        job = db.get(ImportJob, job_id)
+        if job is None or job.status not in ACTIVE_STATUSES:
+            return
+
+        if job.rows_done:
+            logger.info(f"Resuming import job {job_id} after CSV line {job.rows_done}")
+        job.status = RUNNING
+        if job.started_at is None:
+            job.started_at = datetime.now(timezone.utc)
+        db.commit()
+
+        try:
+            finished = _import_batches(db, job, batch_size, should_stop)
+        except Exception as e:
+            logger.error(f"Import job {job_id} failed: {e!s}", exc_info=True)
+            db.rollback()
+            _finish(db, job, FAILED, error=str(e))
+            return
+
+        if finished:
+            _finish(db, job, COMPLETED)
+            logger.info(
+                f"✅ Import job {job_id} completed: {job.tasks_imported} tasks imported, {job.error_count} errors"
+            )
+    finally:
+        db.close()
+
+
+def _import_batches(db: Session, job: ImportJob, batch_size: int, should_stop: Callable[[], bool]) -> bool:
+    """Import the remaining batches of a job, committing each. Returns False when stopped early."""
+    with Path(job.path).open("rb") as binary:
+        for last_row, tasks, errors in iter_task_batches(binary, job.user_id, batch_size, start_row=job.rows_done):
+            job.tasks_imported += insert_tasks(db, job.user_id, tasks)
+            job.rows_done = last_row
+            job.bytes_done = binary.tell()
+            job.error_count += len(errors)
+            if errors and len(job.errors or []) < MAX_REPORTED_ERRORS:
+                job.errors = [*(job.errors or []), *errors][:MAX_REPORTED_ERRORS]
+
+            # Tasks and the resume point commit together
+            db.commit()
+            invalidate_user_stats(job.user_id)
+
+            if should_stop():
+                logger.info(f"Import job {job.id} paused after CSV line {job.rows_done}")
+                return False
+    return True
+
+
+def _finish(db: Session, job: ImportJob, status: str, error: str | None = None) -> None:
+    """Record a job's final status and remove its persisted upload."""
+    job.status = status
+    job.error = error
+    job.finished_at = datetime.now(timezone.utc)
+    if status == COMPLETED:
+        job.bytes_done = job.size_bytes
+    db.commit()
+    Path(job.path).unlink(missing_ok=True)
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Make a datetime aware (SQLite returns naive UTC values)."""
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def _load_active_job_ids() -> list[str]:
+    """Return ids of unfinished jobs, oldest first (blocking)."""
+    db = SessionLocal()
+    try:
+        rows = db.query(ImportJob.id).filter(ImportJob.status.in_(ACTIVE_STATUSES)).order_by(ImportJob.created_at)
+        return [job_id for (job_id,) in rows]
+    finally:
+        db.close()
+
+
+class ImportJobManager:
+    """Runs import jobs in the DB executor, a bounded number at a time."""
+
+    def __init__(self, concurrency: int = 1, batch_size: int = 1000) -> None:
+        """
+        Initialize the manager.
+
+        Args:
+            concurrency: Maximum number of jobs imported at the same time (default: 1)
+            batch_size: Task rows per bulk insert and commit (default: 1000)
+
+        """
+        self.concurrency = max(concurrency, 1)
+        self.batch_size = batch_size
+        # Each running job holds one DB executor thread for its whole duration
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._stopping = threading.Event()
+
+    def submit(self, job_id: str) -> None:
+        """Schedule a job, unless it is already scheduled in this process."""
+        if job_id in self._tasks:
+            return
+
+        task = asyncio.create_task(self._run(job_id))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+
+    async def _run(self, job_id: str) -> None:
+        async with self._semaphore:
+            if self._stopping.is_set():
+                return
+            try:
+                await run_in_db_executor(run_import_job, job_id, self.batch_size, self._stopping.is_set)
+            except Exception as e:
+                logger.error(f"Error running import job {job_id}: {e}", exc_info=True)
+
+    async def resume(self) -> None:
+        """Schedule the jobs left pending or running by a previous process."""
+        self._stopping.clear()
+        job_ids = await run_in_db_executor(_load_active_job_ids)
+        if job_ids:
+            logger.info(f"🔄 Resuming {len(job_ids)} import jobs")
+        for job_id in job_ids:
+            self.submit(job_id)
+
+    async def stop(self) -> None:
+        """Stop after the current batch of each running job; unfinished jobs resume at next startup."""
+        self._stopping.set()
+        tasks = list(self._tasks.values())
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+            logger.info(f"🛑 Paused {len(tasks)} import jobs")
+
+
+@lru_cache(maxsize=1)
+def get_import_job_manager() -> ImportJobManager:
+    """Get or create the global import job manager."""
+    return ImportJobManager(concurrency=settings.import_jobs_concurrency, batch_size=settings.csv_import_batch_size)
+
+
+async def start_import_jobs() -> None:
+    """Resume unfinished import jobs."""
+    await get_import_job_manager().resume()
+
+
+async def stop_import_jobs() -> None:
+    """Pause running import jobs at their next batch boundary."""
+    await get_import_job_manager().stop()
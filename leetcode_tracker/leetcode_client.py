@@ -5,23 +5,164 @@ Fetches user data directly from LeetCode using GraphQL API
 Based on alfa-leetcode-api implementation.
 """
 
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from functools import partial
+import importlib.util
+import json
 import logging
+import random
+import re
 from typing import Any
 
 import httpx
 
+from .cache import TTLCache
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .config import settings
+from .rate_limit import TokenBucket
+
 
 logger = logging.getLogger(__name__)
 
+# Seconds each GraphQL operation is cached for; None means "until the next UTC midnight".
+# Operations not listed here (e.g. the background sync batch) are never cached.
+CACHE_TTLS: dict[str, float | None] = {
+    "getUserProfile": 60,
+    "getUserStats": 60,
+    "getUserSolved": 60,
+    "getUserCalendar": 300,
+    "getRecentSubmissions": 30,
+    "getRecentAcSubmissions": 30,
+    "getUserContest": 600,
+    "getUserBadges": 3600,
+    "getUserLanguageStats": 600,
+    "getUserSkillStats": 600,
+    "questionOfToday": None,
+    "getProblemDetails": 24 * 3600,
+    "getProblemMetadata": 24 * 3600,
+    "problemsetQuestionList": 3600,
+}
+
+_OPERATION_NAME_RE = re.compile(r"^\s*query\s+(\w+)")
+
+
+# Operations with large payloads that get the longer read timeout
+HEAVY_OPERATIONS = {"getProblemDetails", "problemsetQuestionList", "getUsersSyncBatch", "getUserContest"}
+
+# Seconds an idle pooled connection is kept alive for reuse
+KEEPALIVE_EXPIRY = 60.0
+
+HTTP_TOO_MANY_REQUESTS = 429
+HTTP_SERVER_ERROR = 500
+
+# Exponential backoff bounds for retried requests, in seconds
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Return an exponential backoff delay with full jitter for the given retry attempt."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt))
+
+
+def _is_upstream_failure(error: httpx.HTTPError) -> bool:
+    """Whether an error means LeetCode is unhealthy, as opposed to it rejecting one request."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == HTTP_TOO_MANY_REQUESTS or status >= HTTP_SERVER_ERROR
+    return True
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    """Parse the ``Retry-After`` header (seconds or HTTP date), capped at ``BACKOFF_MAX``."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+
+    return min(max(seconds, 0.0), BACKOFF_MAX)
+
+
+def _seconds_until_utc_midnight() -> float:
+    """Return the number of seconds until the next UTC midnight."""
+    now = datetime.now(timezone.utc)
+    midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (midnight - now).total_seconds()
+
 
 class LeetCodeClient:
     """Client for interacting with LeetCode GraphQL API."""
 
     BASE_URL = "https://leetcode.com/graphql"
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        *,
+        cache_size: int = 1024,
+        rate_limit: float = 5.0,
+        rate_burst: int = 10,
+        max_retries: int = 3,
+        circuit_failure_threshold: int = 5,
+        circuit_recovery_timeout: float = 30.0,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        http2: bool = False,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 10.0,
+        heavy_read_timeout: float = 30.0,
+    ) -> None:
+        """
+        Initialize LeetCode client.
+
+        Args:
+            cache_size: Maximum number of cached GraphQL responses
+            rate_limit: Sustained outbound requests per second (0 disables limiting)
+            rate_burst: Maximum burst of requests above the sustained rate
+            max_retries: Retries on HTTP 429/5xx and transport errors
+            circuit_failure_threshold: Consecutive failed requests that open the circuit
+            circuit_recovery_timeout: Seconds before an open circuit lets a probe request through
+            max_connections: Maximum open connections in the HTTP pool
+            max_keepalive_connections: Idle connections kept warm for reuse
+            http2: Multiplex requests over HTTP/2 (needs the ``h2`` package)
+            connect_timeout: Seconds to establish a connection
+            read_timeout: Seconds to wait for a response to a lightweight query
+            heavy_read_timeout: Seconds to wait for a response to a query in ``HEAVY_OPERATIONS``
+
+        """
+        self.cache = TTLCache(max_size=cache_size)
+        self.rate_limiter = TokenBucket(rate=rate_limit, capacity=rate_burst)
+        self.max_retries = max_retries
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=circuit_failure_threshold, recovery_timeout=circuit_recovery_timeout
+        )
+        self._in_flight: dict[tuple[str, str, bool], asyncio.Task] = {}
+        self.coalesced_requests = 0
+        self.retries = 0
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.heavy_read_timeout = heavy_read_timeout
+
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested for LeetCode client but 'h2' is not installed, using HTTP/1.1")
+            http2 = False
+
         self.session = httpx.AsyncClient(
-            timeout=30.0,
+            timeout=self._timeout_for(None),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+            http2=http2,
             headers={
                 "Content-Type": "application/json",
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
@@ -32,18 +173,114 @@ class LeetCodeClient:
         """Close the HTTP session."""
         await self.session.aclose()
 
-    async def _make_request(self, query: str, variables: dict | None = None) -> dict[str, Any]:
-        """Make a GraphQL request to LeetCode API."""
+    def _timeout_for(self, operation: str | None) -> httpx.Timeout:
+        """Return the timeout budget for a GraphQL operation."""
+        read = self.heavy_read_timeout if operation in HEAVY_OPERATIONS else self.read_timeout
+        return httpx.Timeout(read, connect=self.connect_timeout)
+
+    async def _make_request(
+        self, query: str, variables: dict | None = None, *, allow_partial: bool = False
+    ) -> dict[str, Any]:
+        """
+        Make a GraphQL request to LeetCode API.
+
+        Responses of operations listed in ``CACHE_TTLS`` are served from the
+        response cache while fresh. Concurrent identical requests share one
+        in-flight HTTP call. While the circuit breaker is open, requests fail
+        fast with CircuitOpenError unless a stale cached response can be served.
+        Returned values are shared, treat them as read-only.
+
+        Args:
+            query: GraphQL document
+            variables: Query variables
+            allow_partial: Return partial data instead of raising when the response
+                also carries GraphQL errors (e.g. one unknown user in a batched query)
+
+        """
+        match = _OPERATION_NAME_RE.match(query)
+        operation = match.group(1) if match else None
+        variables_key = json.dumps(variables or {}, sort_keys=True)
+
+        if operation in CACHE_TTLS:
+            data = self.cache.get((operation, variables_key))
+            if data is not None:
+                return data
+
+        flight_key = (query, variables_key, allow_partial)
+        flight = self._in_flight.get(flight_key)
+        if flight is None:
+            flight = asyncio.create_task(self._fetch(operation, variables_key, query, variables, allow_partial))
+            flight.add_done_callback(partial(self._finish_flight, flight_key))
+            self._in_flight[flight_key] = flight
+        else:
+            self.coalesced_requests += 1
+
+        try:
+            # Shield so a cancelled caller does not cancel the request other callers are waiting on
+            return await asyncio.shield(flight)
+        except CircuitOpenError:
+            stale = self.cache.get_stale((operation, variables_key)) if operation in CACHE_TTLS else None
+            if stale is None:
+                raise
+            logger.info(f"Serving stale {operation} response while LeetCode circuit is open")
+            return stale
+
+    async def _fetch(
+        self, operation: str | None, variables_key: str, query: str, variables: dict | None, allow_partial: bool
+    ) -> dict[str, Any]:
+        """Send the request and store the response in the cache if its operation is cacheable."""
+        data = await self._send_request(
+            query, variables, allow_partial=allow_partial, request_timeout=self._timeout_for(operation)
+        )
+
+        if operation in CACHE_TTLS:
+            ttl = CACHE_TTLS[operation]
+            self.cache.set((operation, variables_key), data, _seconds_until_utc_midnight() if ttl is None else ttl)
+
+        return data
+
+    def _finish_flight(self, flight_key: tuple[str, str, bool], flight: asyncio.Task) -> None:
+        """Forget a completed in-flight request."""
+        self._in_flight.pop(flight_key, None)
+        # Mark the exception as retrieved in case every waiter was cancelled
+        if not flight.cancelled():
+            flight.exception()
+
+    def stats(self) -> dict[str, Any]:
+        """Return client counters for monitoring."""
+        return {
+            "circuit": self.circuit_breaker.stats(),
+            "cache": self.cache.stats(),
+            "rate_limiter": self.rate_limiter.stats(),
+            "in_flight": len(self._in_flight),
+            "coalesced_requests": self.coalesced_requests,
+            "retries": self.retries,
+        }
+
+    async def _send_request(
+        self,
+        query: str,
+        variables: dict | None = None,
+        *,
+        allow_partial: bool = False,
+        request_timeout: httpx.Timeout | None = None,
+    ) -> dict[str, Any]:
+        """Send a GraphQL request to LeetCode API, bypassing the cache."""
+        payload = {"query": query, "variables": variables or {}}
         try:
-            response = await self.session.post(self.BASE_URL, json={"query": query, "variables": variables or {}})
-            response.raise_for_status()
+            response = await self._post(payload, request_timeout or self._timeout_for(None))
             data = response.json()
 
             if "errors" in data:
+                if allow_partial and data.get("data"):
+                    logger.warning(f"GraphQL partial errors: {data['errors']}")
+                    return data["data"]
                 logger.error(f"GraphQL errors: {data['errors']}")
                 raise Exception(f"GraphQL error: {data['errors']}")
 
             return data.get("data", {})
+        except CircuitOpenError:
+            raise
         except httpx.HTTPError as e:
             logger.error(f"HTTP error fetching from LeetCode: {e}")
             raise
@@ -51,6 +288,58 @@ class LeetCodeClient:
             logger.error(f"Error making LeetCode request: {e}")
             raise
 
+    async def _post(self, payload: dict[str, Any], request_timeout: httpx.Timeout) -> httpx.Response:
+        """POST to the GraphQL endpoint through the circuit breaker."""
+        self.circuit_breaker.before_call()
+        try:
+            response = await self._post_with_retries(payload, request_timeout)
+        except (httpx.HTTPError, asyncio.CancelledError) as e:
+            if isinstance(e, httpx.HTTPError) and not _is_upstream_failure(e):
+                self.circuit_breaker.record_success()
+            else:
+                self.circuit_breaker.record_failure()
+            raise
+
+        self.circuit_breaker.record_success()
+        return response
+
+    async def _post_with_retries(self, payload: dict[str, Any], request_timeout: httpx.Timeout) -> httpx.Response:
+        """
+        POST to the GraphQL endpoint through the rate limiter.
+
+        Retries HTTP 429/5xx and transport errors with exponential backoff and
+        full jitter, honoring ``Retry-After``. A 429 also pauses the limiter so
+        every caller backs off, not just this one.
+        """
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire()
+            try:
+                response = await self.session.post(self.BASE_URL, json=payload, timeout=request_timeout)
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = _backoff_delay(attempt)
+                logger.warning(f"LeetCode request failed ({e!r}), retrying in {delay:.1f}s")
+            else:
+                status = response.status_code
+                if status != HTTP_TOO_MANY_REQUESTS and status < HTTP_SERVER_ERROR:
+                    response.raise_for_status()
+                    return response
+                if attempt >= self.max_retries:
+                    response.raise_for_status()
+
+                delay = _retry_after(response)
+                if delay is None:
+                    delay = _backoff_delay(attempt)
+                if status == HTTP_TOO_MANY_REQUESTS:
+                    self.rate_limiter.pause(delay)
+                logger.warning(f"LeetCode responded {status}, retrying in {delay:.1f}s")
+
+            attempt += 1
+            self.retries += 1
+            await asyncio.sleep(delay)
+
     async def get_user_profile(self, username: str) -> dict[str, Any]:
         """Get user profile information."""
         query = """
@@ -129,14 +418,17 @@ class LeetCodeClient:
         """
 
         data = await self._make_request(query, {"username": username})
-        matched_user = data.get("matchedUser", {})
+        return self._parse_solved_stats(data.get("matchedUser"))
 
-        if not matched_user:
-            return {"solvedProblem": 0, "easySolved": 0, "mediumSolved": 0, "hardSolved": 0}
+    @staticmethod
+    def _parse_solved_stats(matched_user: dict[str, Any] | None) -> dict[str, int]:
+        """Convert a matchedUser.submitStatsGlobal payload into solved counters."""
+        result = {"solvedProblem": 0, "easySolved": 0, "mediumSolved": 0, "hardSolved": 0}
 
-        stats = matched_user.get("submitStatsGlobal", {}).get("acSubmissionNum", [])
+        if not matched_user:
+            return result
 
-        result = {"solvedProblem": 0, "easySolved": 0, "mediumSolved": 0, "hardSolved": 0}
+        stats = (matched_user.get("submitStatsGlobal") or {}).get("acSubmissionNum", [])
 
         for stat in stats:
             difficulty = stat.get("difficulty", "")
@@ -212,6 +504,95 @@ class LeetCodeClient:
         data = await self._make_request(query, {"username": username, "limit": limit})
         return data.get("recentAcSubmissionList", [])
 
+    async def get_users_sync_data(
+        self,
+        usernames: list[str],
+        submissions_limit: int = 20,
+        batch_size: int | None = None,
+        concurrency: int = 1,
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Get profile, solved stats and recent accepted submissions for many users.
+
+        Usernames are packed ``batch_size`` at a time into a single aliased GraphQL
+        document, so N users cost ceil(N / batch_size) requests instead of 3 * N.
+
+        Args:
+            usernames: LeetCode usernames to fetch
+            submissions_limit: Number of recent accepted submissions per user
+            batch_size: Number of users per GraphQL request (default: ``leetcode_sync_batch_size`` setting)
+            concurrency: Maximum number of batch requests in flight
+
+        Returns:
+            Mapping of username to ``{"profile", "solved", "submissions"}``.
+            Users whose chunk failed are missing from the result.
+
+        """
+        result: dict[str, dict[str, Any]] = {}
+        unique = list(dict.fromkeys(usernames))
+        batch_size = max(batch_size or settings.leetcode_sync_batch_size, 1)
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+        async def fetch_chunk(chunk: list[str]) -> None:
+            async with semaphore:
+                try:
+                    result.update(await self._get_users_sync_batch(chunk, submissions_limit))
+                except Exception as e:
+                    logger.error(f"Error fetching sync batch of {len(chunk)} users: {e}")
+
+        await asyncio.gather(
+            *(fetch_chunk(unique[start : start + batch_size]) for start in range(0, len(unique), batch_size))
+        )
+
+        return result
+
+    async def _get_users_sync_batch(self, usernames: list[str], submissions_limit: int) -> dict[str, dict[str, Any]]:
+        """Fetch sync data for one chunk of users with a single aliased GraphQL query."""
+        declarations = ["$limit: Int"]
+        selections = []
+        variables: dict[str, Any] = {"limit": submissions_limit}
+
+        for i, username in enumerate(usernames):
+            declarations.append(f"$u{i}: String!")
+            variables[f"u{i}"] = username
+            selections.append(
+                f"""
+            u{i}: matchedUser(username: $u{i}) {{
+                username
+                profile {{
+                    ranking
+                    reputation
+                }}
+                submitStatsGlobal {{
+                    acSubmissionNum {{
+                        difficulty
+                        count
+                    }}
+                }}
+            }}
+            s{i}: recentAcSubmissionList(username: $u{i}, limit: $limit) {{
+                id
+                title
+                titleSlug
+                timestamp
+                statusDisplay
+                lang
+            }}"""
+            )
+
+        query = f"query getUsersSyncBatch({', '.join(declarations)}) {{{''.join(selections)}\n        }}"
+
+        data = await self._make_request(query, variables, allow_partial=True)
+
+        return {
+            username: {
+                "profile": data.get(f"u{i}") or {},
+                "solved": self._parse_solved_stats(data.get(f"u{i}")),
+                "submissions": data.get(f"s{i}") or [],
+            }
+            for i, username in enumerate(usernames)
+        }
+
     async def get_user_contest_info(self, username: str) -> dict[str, Any]:
         """Get user contest ranking information."""
         query = """
@@ -336,6 +717,27 @@ class LeetCodeClient:
         data = await self._make_request(query, {"titleSlug": title_slug})
         return data.get("question", {})
 
+    async def get_problem_metadata(self, title_slug: str) -> dict[str, Any]:
+        """Get lightweight metadata (id, title, difficulty, tags) for a specific problem."""
+        query = """
+        query getProblemMetadata($titleSlug: String!) {
+            question(titleSlug: $titleSlug) {
+                questionId
+                questionFrontendId
+                title
+                titleSlug
+                difficulty
+                topicTags {
+                    name
+                    slug
+                }
+            }
+        }
+        """
+
+        data = await self._make_request(query, {"titleSlug": title_slug})
+        return data.get("question") or {}
+
     async def get_problems_list(
         self, limit: int = 20, skip: int = 0, difficulty: str | None = None, tags: list[str] | None = None
     ) -> dict[str, Any]:
@@ -439,7 +841,20 @@ class ClientManager:
     @classmethod
     def get_instance(cls) -> LeetCodeClient:
         if cls._instance is None:
-            cls._instance = LeetCodeClient()
+            cls._instance = LeetCodeClient(
+                cache_size=settings.leetcode_cache_size,
+                rate_limit=settings.leetcode_rate_limit,
+                rate_burst=settings.leetcode_rate_burst,
+                max_retries=settings.leetcode_max_retries,
+                circuit_failure_threshold=settings.leetcode_circuit_failure_threshold,
+                circuit_recovery_timeout=settings.leetcode_circuit_recovery_timeout,
+                max_connections=settings.leetcode_max_connections,
+                max_keepalive_connections=settings.leetcode_max_keepalive_connections,
+                http2=settings.leetcode_http2,
+                connect_timeout=settings.leetcode_connect_timeout,
+                read_timeout=settings.leetcode_read_timeout,
+                heavy_read_timeout=settings.leetcode_heavy_read_timeout,
+            )
         return cls._instance
 
     @classmethod
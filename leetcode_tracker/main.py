@@ -4,6 +4,7 @@ import logging
 from pathlib import Path
 
 from fastapi import FastAPI, HTTPException, Request, status
+from fastapi.exception_handlers import http_exception_handler as default_http_exception_handler
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import FileResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
@@ -12,8 +13,10 @@ from starlette.middleware.sessions import SessionMiddleware
 from .background_sync import start_sync_service, stop_sync_service
 from .config import settings
 from .database import Base, engine
-from .leetcode_client import close_leetcode_client
-from .routers import auth, leetcode, profile, stats, sync, tasks
+from .import_jobs import start_import_jobs, stop_import_jobs
+from .leetcode_client import close_leetcode_client, get_leetcode_client
+from .routers import auth, export, leetcode, profile, stats, sync, tasks
+from .stats_cache import get_stats_cache
 
 
 # Configure logging
@@ -59,15 +62,15 @@ logger.info("� Proxy headers: handled by uvicorn --proxy-headers flag")
 
 # Exception handler for 401 Unauthorized - Redirect to login
 @app.exception_handler(HTTPException)
-async def http_exception_handler(_request: Request, exc: HTTPException):
+async def http_exception_handler(request: Request, exc: HTTPException):
     if exc.status_code == status.HTTP_401_UNAUTHORIZED:
         # Clear any existing auth cookies / session data if present on redirect
         response = RedirectResponse(url="/login", status_code=status.HTTP_302_FOUND)
         response.delete_cookie("Authorization", path="/")
         response.delete_cookie("session", path="/")
         return response
-    # For other HTTP exceptions, re-raise to use FastAPI's default handling
-    raise exc
+    # For other HTTP exceptions, use FastAPI's default handling (re-raising would turn them into 500s)
+    return await default_http_exception_handler(request, exc)
 
 
 BASE_DIR = Path(__file__).resolve().parent
@@ -86,7 +89,13 @@ if FRONTEND_DIST_DIR.exists():
 @app.get("/health")
 async def health_check():
     """Health check endpoint for Docker healthcheck."""
-    return {"status": "healthy"}
+    client = get_leetcode_client()
+    return {
+        "status": "healthy",
+        "leetcode_circuit": client.circuit_breaker.state,
+        "leetcode_client": client.stats(),
+        "stats_cache": get_stats_cache().stats(),
+    }
 
 
 # Serve React App for root and fallback - MUST be defined BEFORE including routers
@@ -104,6 +113,7 @@ app.include_router(stats.router)
 app.include_router(leetcode.router)
 app.include_router(sync.router)
 app.include_router(profile.router)
+app.include_router(export.router)
 
 
 # Lifecycle events
@@ -113,12 +123,14 @@ async def startup_event() -> None:
     logger.info("Starting up application...")
     await start_sync_service()
     logger.info("Background sync service started")
+    await start_import_jobs()
 
 
 @app.on_event("shutdown")
 async def shutdown_event() -> None:
     """Clean up resources on shutdown."""
     logger.info("Shutting down application...")
+    await stop_import_jobs()
     await stop_sync_service()
     await close_leetcode_client()
     logger.info("Background sync service and LeetCode client closed")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Date, ForeignKey, Integer, String, Text
+from sqlalchemy import JSON, BigInteger, Column, Date, ForeignKey, Index, Integer, String, Text, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from sqlalchemy.types import DateTime
@@ -25,10 +25,13 @@ class User(Base):
     medium_solved = Column(Integer, nullable=True)
     hard_solved = Column(Integer, nullable=True)
     last_synced_at = Column(DateTime(timezone=True), nullable=True)
+    last_submission_timestamp = Column(BigInteger, nullable=True)  # newest synced submission (unix time)
 
     # Relationships
     tasks = relationship("SolvedTask", back_populates="user", cascade="all, delete-orphan")
     month_goals = relationship("MonthGoal", back_populates="user", cascade="all, delete-orphan")
+    daily_stats = relationship("UserDailyStat", cascade="all, delete-orphan")
+    import_jobs = relationship("ImportJob", cascade="all, delete-orphan")
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
@@ -37,11 +40,12 @@ class SolvedTask(Base):
     __tablename__ = "solved_tasks"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # leads the composite indexes below
     date = Column(Date, nullable=False, index=True)
     platform = Column(String(50), nullable=False, default="leetcode")
     problem_id = Column(String(50), nullable=True)
     title = Column(String(200), nullable=True)
+    title_slug = Column(String(200), nullable=True)  # set for tasks synced from LeetCode
     difficulty = Column(String(10), nullable=False)  # Easy / Medium / Hard
     points = Column(Integer, nullable=False)  # XP
     time_spent = Column(Integer, nullable=True)  # Time in minutes
@@ -52,12 +56,27 @@ class SolvedTask(Base):
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        # Sync identity: one task per problem per day. Manual tasks have no slug and never conflict.
+        Index("uq_solved_tasks_user_slug_date", "user_id", "title_slug", "date", unique=True),
+        # Per-user date ranges and ordering (task list, daily and month stats)
+        Index("ix_solved_tasks_user_date", "user_id", "date"),
+        # Time stats only read tasks with time_spent, ordered by date
+        Index(
+            "ix_solved_tasks_user_date_timed",
+            "user_id",
+            "date",
+            postgresql_where=text("time_spent IS NOT NULL"),
+            sqlite_where=text("time_spent IS NOT NULL"),
+        ),
+    )
+
 
 class MonthGoal(Base):
     __tablename__ = "month_goals"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # leads the unique index below
     year = Column(Integer, nullable=False)
     month = Column(Integer, nullable=False)  # 1-12
     target_xp = Column(Integer, nullable=False, default=100)
@@ -66,3 +85,57 @@ class MonthGoal(Base):
     user = relationship("User", back_populates="month_goals")
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (Index("uq_month_goals_user_year_month", "user_id", "year", "month", unique=True),)
+
+
+class UserDailyStat(Base):
+    """Per-user, per-day, per-difficulty rollup of solved_tasks, maintained on every task write."""
+
+    __tablename__ = "user_daily_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    date = Column(Date, primary_key=True)
+    difficulty = Column(String(10), primary_key=True)
+    tasks_count = Column(Integer, nullable=False, default=0)
+    xp_sum = Column(Integer, nullable=False, default=0)
+    time_spent_sum = Column(Integer, nullable=False, default=0)  # minutes
+    timed_count = Column(Integer, nullable=False, default=0)  # tasks with time_spent set
+
+
+class ImportJob(Base):
+    """Background CSV import: the persisted upload and the progress of its last committed batch."""
+
+    __tablename__ = "import_jobs"
+
+    id = Column(String(32), primary_key=True)  # uuid4 hex
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    filename = Column(String(255), nullable=True)
+    path = Column(String(500), nullable=False)  # persisted upload, removed once the job finishes
+    size_bytes = Column(BigInteger, nullable=False, default=0)
+    status = Column(String(20), nullable=False, default="pending", index=True)  # pending / running / completed / failed
+    rows_done = Column(Integer, nullable=False, default=0)  # last CSV line committed, the resume point
+    bytes_done = Column(BigInteger, nullable=False, default=0)  # approximate, for progress
+    tasks_imported = Column(Integer, nullable=False, default=0)
+    error_count = Column(Integer, nullable=False, default=0)
+    errors = Column(JSON, nullable=True)  # first row errors (capped)
+    error = Column(Text, nullable=True)  # why the job failed
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class Problem(Base):
+    """LeetCode problem metadata catalog, used to resolve difficulty without API calls."""
+
+    __tablename__ = "problems"
+
+    title_slug = Column(String(200), primary_key=True)
+    question_id = Column(String(20), nullable=True, index=True)
+    frontend_id = Column(String(20), nullable=True)
+    title = Column(String(200), nullable=False)
+    difficulty = Column(String(10), nullable=False)  # Easy / Medium / Hard
+    topic_tags = Column(JSON, nullable=True)  # list of tag slugs
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,211 @@
+"""
+LeetCode Problem Catalog.
+
+Keeps problem metadata (difficulty, title, tags) in the ``problems`` table and
+an in-memory slug -> difficulty map, so syncing submissions needs no per-problem
+API calls.
+"""
+
+import asyncio
+from functools import lru_cache
+import logging
+import time
+from typing import Any
+
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+
+from .database import SessionLocal, run_in_db_executor
+from .leetcode_client import LeetCodeClient
+from .models import Problem
+
+
+logger = logging.getLogger(__name__)
+
+# Problems fetched per get_problems_list page during a catalog refresh
+CATALOG_PAGE_SIZE = 100
+
+DEFAULT_DIFFICULTY = "Medium"
+
+# Columns written from a question payload (see _problem_row)
+PROBLEM_COLUMNS = ("title_slug", "question_id", "frontend_id", "title", "difficulty", "topic_tags")
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE
+UPSERT_DIALECTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _problem_row(question: dict[str, Any]) -> dict[str, Any]:
+    """Convert a LeetCode question payload into a ``problems`` row."""
+    return {
+        "title_slug": question["titleSlug"],
+        "question_id": question.get("questionId"),
+        "frontend_id": question.get("questionFrontendId"),
+        "title": question.get("title") or question["titleSlug"],
+        "difficulty": question.get("difficulty") or DEFAULT_DIFFICULTY,
+        "topic_tags": [tag.get("slug") for tag in question.get("topicTags") or []],
+    }
+
+
+def _load_difficulties() -> dict[str, str]:
+    """Read the slug -> difficulty map from the database (blocking)."""
+    db = SessionLocal()
+    try:
+        return dict(db.query(Problem.title_slug, Problem.difficulty).all())
+    finally:
+        db.close()
+
+
+def _store_problems(rows: dict[str, dict[str, Any]]) -> None:
+    """
+    Insert or update catalog rows keyed by slug (blocking).
+
+    Uses ``INSERT ... ON CONFLICT (title_slug) DO UPDATE`` where available, so
+    concurrent syncs storing the same newly seen problem cannot conflict.
+    """
+    if not rows:
+        return
+
+    db = SessionLocal()
+    try:
+        dialect = db.get_bind().dialect.name
+        if dialect in UPSERT_DIALECTS:
+            stmt = UPSERT_DIALECTS[dialect](Problem)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["title_slug"],
+                set_={
+                    **{column: stmt.excluded[column] for column in PROBLEM_COLUMNS if column != "title_slug"},
+                    "updated_at": func.now(),
+                },
+            )
+            db.execute(stmt, list(rows.values()))
+        else:
+            existing = {slug for (slug,) in db.query(Problem.title_slug).filter(Problem.title_slug.in_(rows.keys()))}
+            db.bulk_insert_mappings(Problem, [row for slug, row in rows.items() if slug not in existing])
+            db.bulk_update_mappings(Problem, [row for slug, row in rows.items() if slug in existing])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+class ProblemCatalog:
+    """
+    In-memory view of the persisted problem catalog.
+
+    Database access runs in the DB executor, so the catalog is safe to use from
+    coroutines without blocking the event loop.
+    """
+
+    def __init__(self, refresh_interval: int = 24 * 3600) -> None:
+        """
+        Initialize problem catalog.
+
+        Args:
+            refresh_interval: Seconds after which the catalog is re-fetched from LeetCode (default: 24h)
+
+        """
+        self.refresh_interval = refresh_interval
+        self._difficulties: dict[str, str] = {}
+        self._loaded = False
+        self._refreshed_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_stale(self) -> bool:
+        """Whether the catalog has not been refreshed within ``refresh_interval``."""
+        return self._refreshed_at is None or time.monotonic() - self._refreshed_at > self.refresh_interval
+
+    async def load(self) -> None:
+        """Load the slug -> difficulty map from the database."""
+        self._difficulties = await run_in_db_executor(_load_difficulties)
+        self._loaded = True
+        logger.debug(f"Loaded {len(self._difficulties)} problems from catalog")
+
+    async def refresh(self, client: LeetCodeClient) -> int:
+        """
+        Bulk-fill the catalog from ``get_problems_list`` pages.
+
+        Args:
+            client: LeetCode client
+
+        Returns:
+            Number of problems fetched
+
+        """
+        async with self._lock:
+            return await self._refresh(client)
+
+    async def _refresh(self, client: LeetCodeClient) -> int:
+        """Fetch every problem page and upsert it; caller must hold ``_lock``."""
+        questions: list[dict[str, Any]] = []
+        skip = 0
+        while True:
+            page = await client.get_problems_list(limit=CATALOG_PAGE_SIZE, skip=skip)
+            batch = page.get("questions") or []
+            questions.extend(q for q in batch if q.get("titleSlug"))
+            skip += len(batch)
+            if not batch or skip >= (page.get("total") or 0):
+                break
+
+        rows = {row["title_slug"]: row for row in map(_problem_row, questions)}
+        await run_in_db_executor(_store_problems, rows)
+
+        await self.load()
+        self._refreshed_at = time.monotonic()
+        logger.info(f"📚 Problem catalog refreshed: {len(rows)} problems")
+        return len(rows)
+
+    async def ensure_loaded(self, client: LeetCodeClient) -> None:
+        """Load the catalog from the database, fetching it from LeetCode if empty."""
+        if self._loaded:
+            return
+
+        async with self._lock:
+            if self._loaded:
+                return
+
+            await self.load()
+            if not self._difficulties:
+                await self._refresh(client)
+
+    async def get_difficulties(self, client: LeetCodeClient, title_slugs: set[str]) -> dict[str, str]:
+        """
+        Resolve difficulties for the given problems.
+
+        Known problems are answered from memory. Problems missing from the catalog
+        (e.g. published after the last refresh) are fetched once and persisted.
+
+        Args:
+            client: LeetCode client
+            title_slugs: Problem slugs to resolve
+
+        Returns:
+            Mapping of slug to difficulty
+
+        """
+        await self.ensure_loaded(client)
+
+        fetched: dict[str, dict[str, Any]] = {}
+        for title_slug in title_slugs - self._difficulties.keys():
+            try:
+                question = await client.get_problem_metadata(title_slug)
+            except Exception as e:
+                logger.warning(f"Could not fetch difficulty for {title_slug}: {e}")
+                continue
+
+            if question.get("titleSlug"):
+                fetched[question["titleSlug"]] = _problem_row(question)
+
+        if fetched:
+            await run_in_db_executor(_store_problems, fetched)
+            self._difficulties.update({slug: row["difficulty"] for slug, row in fetched.items()})
+
+        return {slug: self._difficulties.get(slug, DEFAULT_DIFFICULTY) for slug in title_slugs}
+
+
+@lru_cache(maxsize=1)
+def get_problem_catalog() -> ProblemCatalog:
+    """Get or create the global problem catalog instance."""
+    return ProblemCatalog()
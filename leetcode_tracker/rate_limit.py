@@ -0,0 +1,82 @@
+"""Client-side rate limiting for outbound API calls."""
+
+import asyncio
+import time
+from typing import Any
+
+
+class TokenBucket:
+    """Async token-bucket rate limiter."""
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        """
+        Initialize token bucket.
+
+        Args:
+            rate: Tokens added per second (sustained requests/sec budget)
+            capacity: Maximum burst size (default: one second worth of tokens)
+
+        """
+        self.rate = rate
+        self.capacity = max(capacity if capacity is not None else rate, 1.0)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+        self.acquired = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self) -> float:
+        """
+        Wait until a token is available and take it.
+
+        Returns:
+            Seconds spent waiting
+
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        started = time.monotonic()
+        # Waiters queue on the lock, so tokens are handed out in FIFO order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    break
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+        waited = time.monotonic() - started
+        self.acquired += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        return waited
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for ``seconds`` (e.g. after the server answered 429)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+
+    def stats(self) -> dict[str, Any]:
+        """Return limiter counters."""
+        return {
+            "rate": self.rate,
+            "capacity": self.capacity,
+            "acquired": self.acquired,
+            "total_wait_seconds": round(self.total_wait, 3),
+            "max_wait_seconds": round(self.max_wait, 3),
+            "paused": self._paused_until > time.monotonic(),
+        }
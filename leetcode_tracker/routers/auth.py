@@ -8,7 +8,7 @@ import httpx
 from sqlalchemy.orm import Session
 
 from leetcode_tracker import models
-from leetcode_tracker.auth import create_access_token, get_current_user, get_or_create_user, oauth
+from leetcode_tracker.auth import create_access_token, get_current_user_async, get_or_create_user, oauth
 from leetcode_tracker.config import settings
 from leetcode_tracker.dependencies import get_db
 
@@ -22,7 +22,7 @@ router = APIRouter()
 
 
 @router.get("/api/auth/me")
-async def get_current_user_info(current_user: Annotated[models.User, Depends(get_current_user)]):
+async def get_current_user_info(current_user: Annotated[models.User, Depends(get_current_user_async)]):
     """Get current authenticated user information."""
     return {
         "id": current_user.id,
@@ -0,0 +1,80 @@
+"""
+Data Export Router.
+
+Streams the current user's task history (or, for admins, whole tables) as
+CSV, NDJSON or Parquet without loading it into memory.
+"""
+
+from collections.abc import Iterator
+from datetime import datetime, timezone
+import logging
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from leetcode_tracker.dependencies import get_current_admin, get_current_user
+from leetcode_tracker.export import (
+    EXPORT_MEDIA_TYPES,
+    export_chunks,
+    parquet_available,
+    table_statement,
+    user_tasks_statement,
+)
+from leetcode_tracker.models import User
+
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["export"])
+
+ExportFormat = Literal["csv", "parquet", "ndjson"]
+ExportTable = Literal["solved_tasks", "users", "month_goals"]
+
+
+@router.get("/api/export")
+def export_my_tasks(
+    current_user: Annotated[User, Depends(get_current_user)],
+    *,
+    format_: Annotated[ExportFormat, Query(alias="format")] = "csv",
+):
+    """Download the current user's tasks, oldest first."""
+    _require_format(format_)
+    logger.info(f"Exporting tasks of user {current_user.id} as {format_}")
+
+    return _export_response(
+        export_chunks(user_tasks_statement(current_user.id), format_),
+        format_,
+        f"leetcode_tasks_{datetime.now(timezone.utc):%Y-%m-%d}",
+    )
+
+
+@router.get("/api/admin/export")
+def export_table(
+    current_user: Annotated[User, Depends(get_current_admin)],
+    *,
+    format_: Annotated[ExportFormat, Query(alias="format")] = "csv",
+    table: ExportTable = "solved_tasks",
+):
+    """Download a whole table for all users (admins only)."""
+    _require_format(format_)
+    logger.info(f"Admin {current_user.id} exporting {table} as {format_}")
+
+    return _export_response(
+        export_chunks(table_statement(table), format_), format_, f"{table}_{datetime.now(timezone.utc):%Y-%m-%d}"
+    )
+
+
+def _require_format(export_format: str) -> None:
+    """Reject formats whose optional writer is not installed."""
+    if export_format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires the 'parquet' extra (pyarrow)")
+
+
+def _export_response(chunks: Iterator[bytes], export_format: str, basename: str) -> StreamingResponse:
+    """Stream export chunks as a file download."""
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{basename}.{export_format}"'},
+    )
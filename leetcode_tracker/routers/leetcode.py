@@ -4,12 +4,14 @@ LeetCode API Router.
 Provides endpoints to fetch data directly from LeetCode.
 """
 
+import asyncio
 import logging
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 
-from leetcode_tracker.dependencies import get_current_user
+from leetcode_tracker.circuit_breaker import CircuitOpenError
+from leetcode_tracker.dependencies import get_current_user_async
 from leetcode_tracker.leetcode_client import get_leetcode_client
 from leetcode_tracker.models import User
 
@@ -19,8 +21,15 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/leetcode", tags=["leetcode"])
 
 
+def _upstream_error(error: Exception) -> HTTPException:
+    """Map a LeetCode client error to an HTTP error (503 while the circuit is open)."""
+    if isinstance(error, CircuitOpenError):
+        return HTTPException(status_code=503, detail=str(error))
+    return HTTPException(status_code=500, detail=str(error))
+
+
 @router.get("/{username}/profile")
-async def get_leetcode_profile(username: str, _current_user: Annotated[User, Depends(get_current_user)]):
+async def get_leetcode_profile(username: str, _current_user: Annotated[User, Depends(get_current_user_async)]):
     """Get LeetCode user profile information."""
     try:
         client = get_leetcode_client()
@@ -32,11 +41,11 @@ async def get_leetcode_profile(username: str, _current_user: Annotated[User, Dep
         return profile
     except Exception as e:
         logger.error(f"Error fetching LeetCode profile for {username}: {e}")
-        raise HTTPException(status_code=500, detail=str(e)) from e
+        raise _upstream_error(e) from e
 
 
 @router.get("/{username}/solved")
-async def get_leetcode_solved(username: str, _current_user: Annotated[User, Depends(get_current_user)]):
+async def get_leetcode_solved(username: str, _current_user: Annotated[User, Depends(get_current_user_async)]):
     """Get LeetCode user's solved problems statistics."""
     try:
         client = get_leetcode_client()
@@ -44,14 +53,14 @@ async def get_leetcode_solved(username: str, _current_user: Annotated[User, Depe
         return solved
     except Exception as e:
         logger.error(f"Error fetching solved problems for {username}: {e}")
-        raise HTTPException(status_code=500, detail=str(e)) from e
+        raise _upstream_error(e) from e
 
 
 @router.get("/{username}/calendar")
 async def get_leetcode_calendar(
     username: str,
     year: Annotated[int | None, Query(description="Year for calendar data")] = None,
-    _current_user: Annotated[User, Depends(get_current_user)] = None,
+    _current_user: Annotated[User, Depends(get_current_user_async)] = None,
 ):
     """Get LeetCode user's submission calendar."""
     try:
@@ -60,14 +69,14 @@ async def get_leetcode_calendar(
         return calendar
     except Exception as e:
         logger.error(f"Error fetching calendar for {username}: {e}")
-        raise HTTPException(status_code=500, detail=str(e)) from e
+        raise _upstream_error(e) from e
 
 
 @router.get("/{username}/submissions")
 async def get_leetcode_submissions(
     username: str,
     limit: Annotated[int, Query(ge=1, le=100, description="Number of submissions to fetch")] = 20,
-    _current_user: Annotated[User, Depends(get_current_user)] = None,
+    _current_user: Annotated[User, Depends(get_current_user_async)] = None,
 ):
     """Get LeetCode user's recent submissions."""
     try:
@@ -76,14 +85,14 @@ async def get_leetcode_submissions(
         return {"submissions": submissions, "count": len(submissions)}
     except Exception as e:
         logger.error(f"Error fetching submissions for {username}: {e}")
-        raise HTTPException(status_code=500, detail=str(e)) from e
+        raise _upstream_error(e) from e
 
 
 @router.get("/{username}/ac-submissions")
 async def get_leetcode_ac_submissions(
     username: str,
     limit: Annotated[int, Query(ge=1, le=100, description="Number of accepted submissions to fetch")] = 20,
-    _current_user: Annotated[User, Depends(get_current_user)] = None,
+    _current_user: Annotated[User, Depends(get_current_user_async)] = None,
 ):
     """Get LeetCode user's recent accepted submissions."""
     try:
@@ -92,11 +101,11 @@ async def get_leetcode_ac_submissions(
         return {"submissions": submissions, "count": len(submissions)}
     except Exception as e:
         logger.error(f"Error fetching accepted submissions for {username}: {e}")
-        raise HTTPException(status_code=500, detail=str(e)) from e
+        raise _upstream_error(e) from e
 
 
 @router.get("/{username}/contest")
-async def get_leetcode_contest(username: str, _current_user: Annotated[User, Depends(get_current_user)]):
+async def get_leetcode_contest(username: str, _current_user: Annotated[User, Depends(get_current_user_async)]):
     """Get LeetCode user's contest information and history."""
     try:
         client = get_leetcode_client()
@@ -104,11 +113,11 @@ async def get_leetcode_contest(username: str, _current_user: Annotated[User, Dep
         return contest_info
     except Exception as e:
         logger.error(f"Error fetching contest info for {username}: {e}")
-        raise HTTPException(status_code=500, detail=str(e)) from e
+        raise _upstream_error(e) from e
 
 
 @router.get("/{username}/badges")
-async def get_leetcode_badges(username: str, _current_user: Annotated[User, Depends(get_current_user)]):
+async def get_leetcode_badges(username: str, _current_user: Annotated[User, Depends(get_current_user_async)]):
     """Get LeetCode user's badges."""
     try:
         client = get_leetcode_client()
@@ -116,11 +125,11 @@ async def get_leetcode_badges(username: str, _current_user: Annotated[User, Depe
         return badges
     except Exception as e:
         logger.error(f"Error fetching badges for {username}: {e}")
-        raise HTTPException(status_code=500, detail=str(e)) from e
+        raise _upstream_error(e) from e
 
 
 @router.get("/{username}/language-stats")
-async def get_leetcode_language_stats(username: str, _current_user: Annotated[User, Depends(get_current_user)]):
+async def get_leetcode_language_stats(username: str, _current_user: Annotated[User, Depends(get_current_user_async)]):
     """Get LeetCode user's programming language statistics."""
     try:
         client = get_leetcode_client()
@@ -128,11 +137,11 @@ async def get_leetcode_language_stats(username: str, _current_user: Annotated[Us
         return {"languageStats": lang_stats}
     except Exception as e:
         logger.error(f"Error fetching language stats for {username}: {e}")
-        raise HTTPException(status_code=500, detail=str(e)) from e
+        raise _upstream_error(e) from e
 
 
 @router.get("/{username}/skill-stats")
-async def get_leetcode_skill_stats(username: str, _current_user: Annotated[User, Depends(get_current_user)]):
+async def get_leetcode_skill_stats(username: str, _current_user: Annotated[User, Depends(get_current_user_async)]):
     """Get LeetCode user's skill statistics."""
     try:
         client = get_leetcode_client()
@@ -140,11 +149,11 @@ async def get_leetcode_skill_stats(username: str, _current_user: Annotated[User,
         return skill_stats
     except Exception as e:
         logger.error(f"Error fetching skill stats for {username}: {e}")
-        raise HTTPException(status_code=500, detail=str(e)) from e
+        raise _upstream_error(e) from e
 
 
 @router.get("/daily-problem")
-async def get_daily_problem(_current_user: Annotated[User, Depends(get_current_user)]):
+async def get_daily_problem(_current_user: Annotated[User, Depends(get_current_user_async)]):
     """Get today's LeetCode daily coding challenge."""
     try:
         client = get_leetcode_client()
@@ -152,11 +161,11 @@ async def get_daily_problem(_current_user: Annotated[User, Depends(get_current_u
         return daily
     except Exception as e:
         logger.error(f"Error fetching daily problem: {e}")
-        raise HTTPException(status_code=500, detail=str(e)) from e
+        raise _upstream_error(e) from e
 
 
 @router.get("/problem/{title_slug}")
-async def get_problem_details(title_slug: str, _current_user: Annotated[User, Depends(get_current_user)]):
+async def get_problem_details(title_slug: str, _current_user: Annotated[User, Depends(get_current_user_async)]):
     """Get details about a specific LeetCode problem."""
     try:
         client = get_leetcode_client()
@@ -170,7 +179,7 @@ async def get_problem_details(title_slug: str, _current_user: Annotated[User, De
         raise
     except Exception as e:
         logger.error(f"Error fetching problem {title_slug}: {e}")
-        raise HTTPException(status_code=500, detail=str(e)) from e
+        raise _upstream_error(e) from e
 
 
 @router.get("/problems")
@@ -179,7 +188,7 @@ async def get_problems_list(
     skip: Annotated[int, Query(ge=0, description="Number of problems to skip")] = 0,
     difficulty: Annotated[str | None, Query(description="Filter by difficulty: EASY, MEDIUM, HARD")] = None,
     tags: Annotated[str | None, Query(description="Filter by tags (comma-separated)")] = None,
-    _current_user: Annotated[User, Depends(get_current_user)] = None,
+    _current_user: Annotated[User, Depends(get_current_user_async)] = None,
 ):
     """Get list of LeetCode problems with optional filters."""
     try:
@@ -195,32 +204,49 @@ async def get_problems_list(
         return problems
     except Exception as e:
         logger.error(f"Error fetching problems list: {e}")
-        raise HTTPException(status_code=500, detail=str(e)) from e
+        raise _upstream_error(e) from e
+
+
+# Sections returned by the aggregate sync endpoint, in response order
+SYNC_SECTIONS = ("profile", "solved", "calendar", "recentSubmissions")
 
 
 @router.get("/{username}/sync")
-async def sync_leetcode_data(username: str, _current_user: Annotated[User, Depends(get_current_user)]):
+async def sync_leetcode_data(
+    username: str,
+    fields: Annotated[
+        str | None, Query(description=f"Sections to fetch (comma-separated): {', '.join(SYNC_SECTIONS)}")
+    ] = None,
+    _current_user: Annotated[User, Depends(get_current_user_async)] = None,
+):
     """
     Sync all LeetCode data for a user in one call.
 
-    Returns profile, solved stats, calendar, and recent submissions.
+    Returns profile, solved stats, calendar, and recent submissions, or only the
+    sections listed in ``fields``. Sections are fetched concurrently.
     """
+    sections = SYNC_SECTIONS
+    if fields:
+        sections = tuple(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+        unknown = [section for section in sections if section not in SYNC_SECTIONS]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(SYNC_SECTIONS)}",
+            )
+
     try:
         client = get_leetcode_client()
 
-        # Fetch all data concurrently would be better, but for simplicity doing sequentially
-        profile = await client.get_user_profile(username)
-        solved = await client.get_user_solved_problems(username)
-        calendar = await client.get_user_calendar(username)
-        submissions = await client.get_recent_ac_submissions(username, limit=20)
-
-        return {
-            "username": username,
-            "profile": profile,
-            "solved": solved,
-            "calendar": calendar,
-            "recentSubmissions": submissions,
+        fetchers = {
+            "profile": lambda: client.get_user_profile(username),
+            "solved": lambda: client.get_user_solved_problems(username),
+            "calendar": lambda: client.get_user_calendar(username),
+            "recentSubmissions": lambda: client.get_recent_ac_submissions(username, limit=20),
         }
+        results = await asyncio.gather(*(fetchers[section]() for section in sections))
+
+        return {"username": username, **dict(zip(sections, results, strict=True))}
     except Exception as e:
         logger.error(f"Error syncing LeetCode data for {username}: {e}")
-        raise HTTPException(status_code=500, detail=str(e)) from e
+        raise _upstream_error(e) from e
@@ -8,10 +8,8 @@ import logging
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, Form, HTTPException
-from sqlalchemy.orm import Session
 
-from leetcode_tracker.database import get_db
-from leetcode_tracker.dependencies import get_current_user
+from leetcode_tracker.dependencies import AsyncDBSession, get_async_db, get_current_user_async
 from leetcode_tracker.leetcode_client import get_leetcode_client
 from leetcode_tracker.models import User
 
@@ -22,9 +20,7 @@ router = APIRouter(prefix="/api/profile", tags=["profile"])
 
 
 @router.get("/me")
-async def get_my_profile(
-    current_user: Annotated[User, Depends(get_current_user)], _db: Annotated[Session, Depends(get_db)]
-):
+async def get_my_profile(current_user: Annotated[User, Depends(get_current_user_async)]):
     """Get current user's profile."""
     return {
         "id": current_user.id,
@@ -40,8 +36,8 @@ async def get_my_profile(
 @router.put("/leetcode")
 async def update_leetcode_settings(
     leetcode_username: Annotated[str, Form()],
-    current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user_async)],
+    db: Annotated[AsyncDBSession, Depends(get_async_db)],
 ):
     """
     Update LeetCode username for automatic synchronization.
@@ -62,10 +58,12 @@ async def update_leetcode_settings(
                 ),
             )
 
-        # Update user's LeetCode username
+        # Update user's LeetCode username (and restart sync from scratch if it changed)
+        if current_user.leetcode_username != leetcode_username:
+            current_user.last_submission_timestamp = None
         current_user.leetcode_username = leetcode_username
-        db.commit()
-        db.refresh(current_user)
+        await db.commit()
+        await db.refresh(current_user)
 
         logger.info(f"User {current_user.id} updated LeetCode username to {leetcode_username}")
 
@@ -92,11 +90,13 @@ async def update_leetcode_settings(
 
 @router.delete("/leetcode")
 async def remove_leetcode_settings(
-    current_user: Annotated[User, Depends(get_current_user)], db: Annotated[Session, Depends(get_db)]
+    current_user: Annotated[User, Depends(get_current_user_async)],
+    db: Annotated[AsyncDBSession, Depends(get_async_db)],
 ):
     """Remove LeetCode username (stops automatic synchronization)."""
     current_user.leetcode_username = None
-    db.commit()
+    current_user.last_submission_timestamp = None
+    await db.commit()
 
     logger.info(f"User {current_user.id} removed LeetCode username")
 
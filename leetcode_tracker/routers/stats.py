@@ -1,32 +1,91 @@
 import calendar
 from collections import defaultdict
+from collections.abc import Iterable, Iterator
 from datetime import date, timedelta
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import extract
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from leetcode_tracker import models, schemas
-from leetcode_tracker.dependencies import get_current_user, get_db
+from leetcode_tracker.dependencies import (
+    AsyncDBSession,
+    get_async_db,
+    get_current_user,
+    get_current_user_async,
+    get_db,
+)
+from leetcode_tracker.stats_cache import get_stats_cache, invalidate_user_stats
 
 
 router = APIRouter()
 
 
+def _month_range(year: int, month: int) -> tuple[date, date]:
+    """Return the month as a half-open ``[first day, first day of next month)`` date range."""
+    _, num_days = calendar.monthrange(year, month)
+    month_start = date(year, month, 1)
+    return month_start, month_start + timedelta(days=num_days)
+
+
+async def _get_or_create_month_goal(db: AsyncDBSession, user_id: int, year: int, month: int) -> models.MonthGoal:
+    """Return the user's goal for the month, creating the default one if missing."""
+    statement = select(models.MonthGoal).where(
+        models.MonthGoal.user_id == user_id, models.MonthGoal.year == year, models.MonthGoal.month == month
+    )
+    goal = (await db.execute(statement)).scalars().first()
+    if goal:
+        return goal
+
+    goal = models.MonthGoal(user_id=user_id, year=year, month=month, target_xp=100)
+    db.add(goal)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # A concurrent request created it first (unique user/year/month)
+        await db.rollback()
+        return (await db.execute(statement)).scalars().one()
+
+    await db.refresh(goal)
+    return goal
+
+
 @router.get("/api/stats/time")
-def get_time_stats(
-    current_user: Annotated[models.User, Depends(get_current_user)], db: Annotated[Session, Depends(get_db)]
+async def get_time_stats(
+    request: Request,
+    current_user: Annotated[models.User, Depends(get_current_user_async)],
+    db: Annotated[AsyncDBSession, Depends(get_async_db)],
+    include_tasks: bool = True,
 ):
     """Get time statistics for tasks with time_spent data."""
-    tasks = (
-        db.query(models.SolvedTask)
-        .filter(models.SolvedTask.user_id == current_user.id, models.SolvedTask.time_spent.isnot(None))
-        .order_by(models.SolvedTask.date.asc())
-        .all()
+    return await get_stats_cache().respond_async(
+        request,
+        current_user.id,
+        "time",
+        {"include_tasks": include_tasks},
+        lambda: _time_stats(db, current_user.id, include_tasks),
     )
 
-    if not tasks:
+
+async def _time_stats(db: AsyncDBSession, user_id: int, include_tasks: bool) -> dict:
+    """Compute time statistics of a user."""
+    # Totals come from the daily rollup; only the per-task chart data needs task rows
+    totals = (
+        await db.execute(
+            select(
+                models.UserDailyStat.difficulty,
+                func.sum(models.UserDailyStat.time_spent_sum),
+                func.sum(models.UserDailyStat.timed_count),
+            )
+            .where(models.UserDailyStat.user_id == user_id)
+            .group_by(models.UserDailyStat.difficulty)
+        )
+    ).all()
+    timed_count = sum(count for _, _, count in totals)
+
+    if not timed_count:
         return {
             "tasks": [],
             "average_time": 0,
@@ -35,28 +94,35 @@ def get_time_stats(
         }
 
     # Calculate average time by difficulty
-    time_by_difficulty = {"Easy": [], "Medium": [], "Hard": []}
-    for task in tasks:
-        if task.time_spent and task.difficulty in time_by_difficulty:
-            time_by_difficulty[task.difficulty].append(task.time_spent)
-
-    avg_by_difficulty = {diff: (sum(times) / len(times) if times else 0) for diff, times in time_by_difficulty.items()}
+    avg_by_difficulty = {"Easy": 0, "Medium": 0, "Hard": 0}
+    for difficulty, time_sum, count in totals:
+        if difficulty in avg_by_difficulty and count:
+            avg_by_difficulty[difficulty] = time_sum / count
 
-    total_time = sum(t.time_spent for t in tasks if t.time_spent)
-    average_time = total_time / len(tasks) if tasks else 0
+    total_time = sum(time_sum for _, time_sum, _ in totals)
+    average_time = total_time / timed_count
 
     # Format tasks for chart
-    task_list = [
-        {
-            "id": t.id,
-            "title": t.title or (f"Task #{t.problem_id}" if t.problem_id else f"Task {t.id}"),
-            "difficulty": t.difficulty,
-            "time_spent": t.time_spent,
-            "date": str(t.date),
-            "points": t.points,
-        }
-        for t in tasks
-    ]
+    task_list = []
+    if include_tasks:
+        tasks = (
+            await db.execute(
+                select(models.SolvedTask)
+                .where(models.SolvedTask.user_id == user_id, models.SolvedTask.time_spent.isnot(None))
+                .order_by(models.SolvedTask.date.asc())
+            )
+        ).scalars()
+        task_list = [
+            {
+                "id": t.id,
+                "title": t.title or (f"Task #{t.problem_id}" if t.problem_id else f"Task {t.id}"),
+                "difficulty": t.difficulty,
+                "time_spent": t.time_spent,
+                "date": str(t.date),
+                "points": t.points,
+            }
+            for t in tasks
+        ]
 
     return {
         "tasks": task_list,
@@ -67,85 +133,72 @@ def get_time_stats(
 
 
 @router.get("/api/stats/daily", response_model=list[schemas.DailyStat])
-def api_daily_stats(
-    current_user: Annotated[models.User, Depends(get_current_user)], db: Annotated[Session, Depends(get_db)]
+async def api_daily_stats(
+    request: Request,
+    current_user: Annotated[models.User, Depends(get_current_user_async)],
+    db: Annotated[AsyncDBSession, Depends(get_async_db)],
 ):
     """Aggregate stats per day for current user."""
-    rows = (
-        db.query(models.SolvedTask.date)
-        .filter(models.SolvedTask.user_id == current_user.id)
-        .distinct()
-        .order_by(models.SolvedTask.date.asc())
-        .all()
+    return await get_stats_cache().respond_async(
+        request, current_user.id, "daily", {}, lambda: _daily_stats_of(db, current_user.id)
     )
 
-    if not rows:
-        return []
 
-    all_dates: list[date] = []
-    if rows:
-        cur = rows[0][0]
-        last = rows[-1][0]
-        while cur <= last:
-            all_dates.append(cur)
-            cur = cur + timedelta(days=1)
+async def _daily_stats_of(db: AsyncDBSession, user_id: int) -> list[dict]:
+    """Compute the gap-filled daily stats of a user from the rollup."""
+    rows = await db.execute(
+        select(
+            models.UserDailyStat.date,
+            func.sum(models.UserDailyStat.tasks_count),
+            func.sum(models.UserDailyStat.xp_sum),
+        )
+        .where(models.UserDailyStat.user_id == user_id)
+        .group_by(models.UserDailyStat.date)
+        .order_by(models.UserDailyStat.date.asc())
+    )
 
-    count_by_date: dict[date, int] = defaultdict(int)
-    xp_by_date: dict[date, int] = defaultdict(int)
+    return list(_daily_stats(rows))
+
+
+def _daily_stats(rows: Iterable[tuple[date, int, int]]) -> Iterator[dict]:
+    """
+    Turn per-day ``(date, tasks_count, xp_sum)`` rows into gap-filled daily stats.
 
-    tasks = db.query(models.SolvedTask).filter(models.SolvedTask.user_id == current_user.id).all()
+    Args:
+        rows: Aggregated rows ordered by date, days without tasks omitted
 
-    for t in tasks:
-        count_by_date[t.date] += 1
-        xp_by_date[t.date] += t.points
+    Returns:
+        Iterator over one stat per day from the first to the last row, with streak and cumulative XP
 
-    stats: list[schemas.DailyStat] = []
+    """
     streak = 0
     xp_cum = 0
-    for d in all_dates:
-        tasks_count = count_by_date[d]
-        xp_sum = xp_by_date[d]
-        if tasks_count > 0:
-            streak += 1
-        else:
-            streak = 0
+    prev: date | None = None
+    for day, tasks_count, xp_sum in rows:
+        if prev is not None:
+            # Days without tasks between two active days break the streak
+            gap_day = prev + timedelta(days=1)
+            if gap_day < day:
+                streak = 0
+            while gap_day < day:
+                yield {"date": gap_day, "tasks_count": 0, "xp_sum": 0, "streak": 0, "xp_cumulative": xp_cum}
+                gap_day += timedelta(days=1)
+
+        streak += 1
         xp_cum += xp_sum
-        stats.append(
-            schemas.DailyStat(
-                date=d,
-                tasks_count=tasks_count,
-                xp_sum=xp_sum,
-                streak=streak,
-                xp_cumulative=xp_cum,
-            )
-        )
-
-    return stats
+        yield {"date": day, "tasks_count": tasks_count, "xp_sum": xp_sum, "streak": streak, "xp_cumulative": xp_cum}
+        prev = day
 
 
 @router.get("/api/month/goal/{year}/{month}", response_model=schemas.MonthGoal)
-def get_month_goal(
+async def get_month_goal(
     year: int,
     month: int,
-    current_user: Annotated[models.User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[models.User, Depends(get_current_user_async)],
+    db: Annotated[AsyncDBSession, Depends(get_async_db)],
 ):
     """Get or create month goal for current user."""
-    goal = (
-        db.query(models.MonthGoal)
-        .filter(
-            models.MonthGoal.user_id == current_user.id, models.MonthGoal.year == year, models.MonthGoal.month == month
-        )
-        .first()
-    )
-
-    if not goal:
-        goal = models.MonthGoal(user_id=current_user.id, year=year, month=month, target_xp=100)
-        db.add(goal)
-        db.commit()
-        db.refresh(goal)
-
-    return goal
+    return await _get_or_create_month_goal(db, current_user.id, year, month)
 
 
 @router.post("/api/month/goal")
@@ -168,85 +221,111 @@ def set_month_goal(
     if existing:
         existing.target_xp = goal_data.target_xp
         db.commit()
+        invalidate_user_stats(current_user.id)
         db.refresh(existing)
         return existing
     goal = models.MonthGoal(**goal_data.dict(), user_id=current_user.id)
     db.add(goal)
     db.commit()
+    invalidate_user_stats(current_user.id)
     db.refresh(goal)
     return goal
 
 
 @router.get("/api/month/stats/{year}/{month}", response_model=schemas.MonthStats)
-def get_month_stats(
+async def get_month_stats(
+    request: Request,
     year: int,
     month: int,
-    current_user: Annotated[models.User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[models.User, Depends(get_current_user_async)],
+    db: Annotated[AsyncDBSession, Depends(get_async_db)],
+    *,
+    include_tasks: bool = True,
 ):
     """Get complete month statistics for current user."""
-    # Get or create goal
-    goal = (
-        db.query(models.MonthGoal)
-        .filter(
-            models.MonthGoal.user_id == current_user.id, models.MonthGoal.year == year, models.MonthGoal.month == month
-        )
-        .first()
+    return await get_stats_cache().respond_async(
+        request,
+        current_user.id,
+        "month",
+        {"year": year, "month": month, "include_tasks": include_tasks},
+        lambda: _month_stats(db, current_user.id, year, month, include_tasks),
     )
 
-    if not goal:
-        goal = models.MonthGoal(user_id=current_user.id, year=year, month=month, target_xp=100)
-        db.add(goal)
-        db.commit()
 
-    # Get all tasks for this month
-    tasks = (
-        db.query(models.SolvedTask)
-        .filter(
-            models.SolvedTask.user_id == current_user.id,
-            extract("year", models.SolvedTask.date) == year,
-            extract("month", models.SolvedTask.date) == month,
+async def _month_stats(
+    db: AsyncDBSession, user_id: int, year: int, month: int, include_tasks: bool
+) -> schemas.MonthStats:
+    """Compute the month statistics and calendar of a user."""
+    # Get or create goal
+    goal = await _get_or_create_month_goal(db, user_id, year, month)
+
+    # Per-day rollup rows for this month (half-open range, so the primary key index is used)
+    month_start, month_end = _month_range(year, month)
+    rows = (
+        await db.execute(
+            select(
+                models.UserDailyStat.date,
+                models.UserDailyStat.difficulty,
+                models.UserDailyStat.tasks_count,
+                models.UserDailyStat.xp_sum,
+            ).where(
+                models.UserDailyStat.user_id == user_id,
+                models.UserDailyStat.date >= month_start,
+                models.UserDailyStat.date < month_end,
+            )
         )
-        .order_by(models.SolvedTask.date.asc())
-        .all()
-    )
+    ).all()
+
+    # Group counts and XP by date and difficulty
+    counts_by_date: dict[date, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    xp_by_date: dict[date, int] = defaultdict(int)
+    for day_date, difficulty, tasks_count, xp_sum in rows:
+        counts_by_date[day_date][difficulty] += tasks_count
+        xp_by_date[day_date] += xp_sum
+
+    # Task lists for the calendar days are optional, everything else comes from the rollup
+    tasks_by_date = defaultdict(list)
+    if include_tasks:
+        tasks = (
+            await db.execute(
+                select(models.SolvedTask)
+                .where(
+                    models.SolvedTask.user_id == user_id,
+                    models.SolvedTask.date >= month_start,
+                    models.SolvedTask.date < month_end,
+                )
+                .order_by(models.SolvedTask.date.asc())
+            )
+        ).scalars()
+        for task in tasks:
+            tasks_by_date[task.date].append(task)
 
     # Calculate stats
-    total_xp = sum(t.points for t in tasks)
-    total_tasks = len(tasks)
-    easy_count = len([t for t in tasks if t.difficulty == "Easy"])
-    medium_count = len([t for t in tasks if t.difficulty == "Medium"])
-    hard_count = len([t for t in tasks if t.difficulty == "Hard"])
+    total_xp = sum(xp_by_date.values())
+    total_tasks = sum(sum(counts.values()) for counts in counts_by_date.values())
+    easy_count = sum(counts["Easy"] for counts in counts_by_date.values())
+    medium_count = sum(counts["Medium"] for counts in counts_by_date.values())
+    hard_count = sum(counts["Hard"] for counts in counts_by_date.values())
     progress = (total_xp / goal.target_xp * 100) if goal.target_xp > 0 else 0
 
     # Build calendar
     _, num_days = calendar.monthrange(year, month)
     calendar_days = []
 
-    # Group tasks by date
-    tasks_by_date = defaultdict(list)
-    for task in tasks:
-        tasks_by_date[task.date].append(task)
-
     # Create calendar days
     for day in range(1, num_days + 1):
         day_date = date(year, month, day)
-        day_tasks = tasks_by_date.get(day_date, [])
-
-        day_xp = sum(t.points for t in day_tasks)
-        day_easy = len([t for t in day_tasks if t.difficulty == "Easy"])
-        day_medium = len([t for t in day_tasks if t.difficulty == "Medium"])
-        day_hard = len([t for t in day_tasks if t.difficulty == "Hard"])
+        day_counts = counts_by_date.get(day_date, {})
 
         calendar_days.append(
             schemas.CalendarDay(
                 date=day_date,
-                tasks_count=len(day_tasks),
-                xp_sum=day_xp,
-                easy_count=day_easy,
-                medium_count=day_medium,
-                hard_count=day_hard,
-                tasks=day_tasks,
+                tasks_count=sum(day_counts.values()),
+                xp_sum=xp_by_date.get(day_date, 0),
+                easy_count=day_counts.get("Easy", 0),
+                medium_count=day_counts.get("Medium", 0),
+                hard_count=day_counts.get("Hard", 0),
+                tasks=tasks_by_date.get(day_date, []),
             )
         )
 
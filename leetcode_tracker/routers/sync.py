@@ -4,17 +4,19 @@ LeetCode Sync Router.
 Synchronizes tasks from LeetCode to local database.
 """
 
-from datetime import datetime, timezone
 import logging
 from typing import Annotated
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
 
-from leetcode_tracker.database import get_db
-from leetcode_tracker.dependencies import get_current_user
+from leetcode_tracker.database import SessionLocal, run_in_db_executor
+from leetcode_tracker.dependencies import AsyncDBSession, get_async_db, get_current_user_async
 from leetcode_tracker.leetcode_client import get_leetcode_client
 from leetcode_tracker.models import SolvedTask, User
+from leetcode_tracker.problem_catalog import get_problem_catalog
+from leetcode_tracker.stats_cache import invalidate_user_stats
+from leetcode_tracker.task_sync import save_submissions
 
 
 logger = logging.getLogger(__name__)
@@ -35,13 +37,23 @@ def get_difficulty_from_problem(_problem_title: str, _leetcode_username: str) ->
     return "Medium"
 
 
-def calculate_xp(difficulty: str) -> int:
-    """Calculate XP based on difficulty."""
-    xp_map = {"Easy": 1, "Medium": 3, "Hard": 5}
-    return xp_map.get(difficulty, 3)
+def _store_submissions(user_id: int, submissions: list[dict], difficulties: dict[str, str]) -> int:
+    """Save synced submissions in a fresh session and commit (blocking)."""
+    db = SessionLocal()
+    try:
+        synced_count = save_submissions(db, user_id, submissions, difficulties)
+        db.commit()
+        if synced_count:
+            invalidate_user_stats(user_id)
+        return synced_count
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
 
 
-async def sync_leetcode_submissions(user_id: int, leetcode_username: str, db: Session, limit: int = 100):
+async def sync_leetcode_submissions(user_id: int, leetcode_username: str, limit: int = 100):
     """Background task to sync LeetCode submissions to database."""
     try:
         logger.info(f"Starting sync for user {user_id}, LeetCode username: {leetcode_username}")
@@ -53,70 +65,14 @@ async def sync_leetcode_submissions(user_id: int, leetcode_username: str, db: Se
 
         logger.info(f"Fetched {len(submissions)} submissions from LeetCode")
 
-        synced_count = 0
-        skipped_count = 0
-
-        # Get problem details to determine difficulty
-        # We'll need to fetch this for unique problems
-        problem_difficulties = {}
-
-        for submission in submissions:
-            try:
-                # Convert timestamp to date
-                submission_date = datetime.fromtimestamp(int(submission["timestamp"]), tz=timezone.utc).date()
-                title = submission["title"]
-                title_slug = submission["titleSlug"]
-
-                # Check if this task already exists
-                existing = (
-                    db.query(SolvedTask)
-                    .filter(
-                        SolvedTask.user_id == user_id, SolvedTask.title == title, SolvedTask.date == submission_date
-                    )
-                    .first()
-                )
-
-                if existing:
-                    skipped_count += 1
-                    continue
-
-                # Get difficulty for this problem (cache it)
-                if title_slug not in problem_difficulties:
-                    try:
-                        problem_details = await client.get_problem_details(title_slug)
-                        difficulty = problem_details.get("difficulty", "Medium")
-                        problem_difficulties[title_slug] = difficulty
-                    except Exception as e:
-                        logger.warning(f"Could not fetch difficulty for {title_slug}: {e}")
-                        difficulty = "Medium"  # Default
-                        problem_difficulties[title_slug] = difficulty
-                else:
-                    difficulty = problem_difficulties[title_slug]
-
-                # Calculate XP
-                points = calculate_xp(difficulty)
-
-                # Create new task
-                task = SolvedTask(
-                    user_id=user_id,
-                    date=submission_date,
-                    title=title,
-                    problem_id=submission.get("id"),
-                    difficulty=difficulty,
-                    points=points,
-                    platform="leetcode",
-                    notes=f"Synced from LeetCode (Language: {submission.get('lang', 'Unknown')})",
-                )
-
-                db.add(task)
-                synced_count += 1
-
-            except Exception as e:
-                logger.error(f"Error processing submission {submission.get('title')}: {e}")
-                continue
-
-        # Commit all changes
-        db.commit()
+        # Resolve difficulties from the problem catalog (no per-problem API calls)
+        difficulties = await get_problem_catalog().get_difficulties(
+            client, {submission["titleSlug"] for submission in submissions}
+        )
+
+        # Queries and the commit run in the DB executor, off the event loop
+        synced_count = await run_in_db_executor(_store_submissions, user_id, submissions, difficulties)
+        skipped_count = len(submissions) - synced_count
 
         logger.info(f"Sync completed: {synced_count} new tasks added, {skipped_count} skipped (already exist)")
 
@@ -124,15 +80,14 @@ async def sync_leetcode_submissions(user_id: int, leetcode_username: str, db: Se
 
     except Exception as e:
         logger.error(f"Error during sync: {e}")
-        db.rollback()
         raise
 
 
 @router.put("/leetcode-username")
 async def set_leetcode_username(
     leetcode_username: str,
-    current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user_async)],
+    db: Annotated[AsyncDBSession, Depends(get_async_db)],
 ):
     """Set or update LeetCode username for the current user."""
     try:
@@ -143,9 +98,11 @@ async def set_leetcode_username(
         if not profile:
             raise HTTPException(status_code=404, detail=f"LeetCode user '{leetcode_username}' not found")
 
-        # Update user's LeetCode username
+        # Update user's LeetCode username (and restart sync from scratch if it changed)
+        if current_user.leetcode_username != leetcode_username:
+            current_user.last_submission_timestamp = None
         current_user.leetcode_username = leetcode_username
-        db.commit()
+        await db.commit()
 
         return {"message": "LeetCode username updated successfully", "leetcode_username": leetcode_username}
 
@@ -160,8 +117,7 @@ async def set_leetcode_username(
 async def sync_from_leetcode(
     background_tasks: BackgroundTasks,
     limit: int = 100,
-    current_user: Annotated[User, Depends(get_current_user)] = None,
-    db: Annotated[Session, Depends(get_db)] = None,
+    current_user: Annotated[User, Depends(get_current_user_async)] = None,
 ):
     """
     Sync tasks from LeetCode to local database.
@@ -175,7 +131,7 @@ async def sync_from_leetcode(
         )
 
     # Start background sync
-    background_tasks.add_task(sync_leetcode_submissions, current_user.id, current_user.leetcode_username, db, limit)
+    background_tasks.add_task(sync_leetcode_submissions, current_user.id, current_user.leetcode_username, limit)
 
     return {
         "message": "Sync started in background",
@@ -186,12 +142,15 @@ async def sync_from_leetcode(
 
 @router.get("/status")
 async def get_sync_status(
-    current_user: Annotated[User, Depends(get_current_user)], db: Annotated[Session, Depends(get_db)]
+    current_user: Annotated[User, Depends(get_current_user_async)],
+    db: Annotated[AsyncDBSession, Depends(get_async_db)],
 ):
     """Get sync status and LeetCode username."""
     # Get total tasks from LeetCode
-    total_tasks = (
-        db.query(SolvedTask).filter(SolvedTask.user_id == current_user.id, SolvedTask.platform == "leetcode").count()
+    total_tasks = await db.scalar(
+        select(func.count())
+        .select_from(SolvedTask)
+        .where(SolvedTask.user_id == current_user.id, SolvedTask.platform == "leetcode")
     )
 
     return {
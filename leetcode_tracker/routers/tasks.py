@@ -1,15 +1,30 @@
-import csv
+import base64
+from collections.abc import Iterator
 from datetime import date
-import io
+import json
 import logging
-from typing import Annotated
+from typing import Annotated, Any, BinaryIO, Literal
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, UploadFile
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, RedirectResponse, StreamingResponse
+from sqlalchemy import Select, select, tuple_
 from sqlalchemy.orm import Session
 
 from leetcode_tracker import models, schemas
-from leetcode_tracker.dependencies import get_current_user, get_db
+from leetcode_tracker.config import settings
+from leetcode_tracker.csv_import import import_csv
+from leetcode_tracker.daily_stats import clear_daily_stats, refresh_daily_stats
+from leetcode_tracker.database import SessionLocal, run_in_db_executor
+from leetcode_tracker.dependencies import (
+    AsyncDBSession,
+    get_async_db,
+    get_current_user,
+    get_current_user_async,
+    get_db,
+)
+from leetcode_tracker.import_jobs import COMPLETED, create_import_job, get_import_job_manager, import_job_progress
+from leetcode_tracker.stats_cache import get_stats_cache, invalidate_user_stats
 
 
 # Configure logging
@@ -18,6 +33,15 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Columns a task can be projected to, in response order
+TASK_FIELDS = tuple(schemas.Task.model_fields)
+# Keyset pagination order: newest first, id breaks ties within a day
+CURSOR_FIELDS = ("date", "id")
+MAX_PAGE_SIZE = 1000
+# Rows fetched (server-side cursor on PostgreSQL) and written per chunk in streaming mode
+STREAM_BATCH_SIZE = 1000
+STREAM_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "json": "application/json"}
+
 
 @router.post("/add")
 def add_task(
@@ -51,7 +75,9 @@ def add_task(
         task = models.SolvedTask(**task_data, user_id=current_user.id)
 
         db.add(task)
+        refresh_daily_stats(db, current_user.id, [task.date])
         db.commit()
+        invalidate_user_stats(current_user.id)
         db.refresh(task)
 
         logger.info(f"Task {task.id} successfully added for user {current_user.id}")
@@ -64,27 +90,152 @@ def add_task(
 
 
 @router.get("/api/tasks", response_model=list[schemas.Task])
-def api_tasks(
-    current_user: Annotated[models.User, Depends(get_current_user)], db: Annotated[Session, Depends(get_db)]
+async def api_tasks(
+    request: Request,
+    current_user: Annotated[models.User, Depends(get_current_user_async)],
+    db: Annotated[AsyncDBSession, Depends(get_async_db)],
+    *,
+    limit: Annotated[int | None, Query(ge=1, le=MAX_PAGE_SIZE)] = None,
+    cursor: str | None = None,
+    fields: str | None = None,
+    difficulty: str | None = None,
+    platform: str | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    stream: Literal["ndjson", "json"] | None = None,
 ):
-    """Return all tasks for current user."""
+    """
+    Return tasks for current user, newest first.
+
+    With ``limit`` the list is a page; the ``X-Next-Cursor`` response header holds
+    the ``cursor`` for the next page (absent on the last one). ``fields`` is a
+    comma-separated projection (``id`` and ``date`` are always included).
+    ``date_from``/``date_to`` are inclusive. ``stream=ndjson|json`` streams all
+    matching tasks as NDJSON or a chunked JSON array instead (not cached).
+    """
     logger.info(f"Fetching tasks for user {current_user.id}")
 
-    try:
-        tasks = (
-            db.query(models.SolvedTask)
-            .filter(models.SolvedTask.user_id == current_user.id)
-            .order_by(models.SolvedTask.date.desc())
-            .all()
-        )
+    columns = _parse_fields(fields)
+    after = _decode_cursor(cursor) if cursor else None
+
+    statement = select(*(getattr(models.SolvedTask, column) for column in columns)).where(
+        models.SolvedTask.user_id == current_user.id
+    )
+    if difficulty:
+        statement = statement.where(models.SolvedTask.difficulty == difficulty)
+    if platform:
+        statement = statement.where(models.SolvedTask.platform == platform)
+    if date_from:
+        statement = statement.where(models.SolvedTask.date >= date_from)
+    if date_to:
+        statement = statement.where(models.SolvedTask.date <= date_to)
+    if after:
+        # Keyset: continue strictly after the last (date, id) of the previous page
+        statement = statement.where(tuple_(models.SolvedTask.date, models.SolvedTask.id) < after)
+
+    statement = statement.order_by(models.SolvedTask.date.desc(), models.SolvedTask.id.desc())
+    if limit:
+        statement = statement.limit(limit)
+
+    if stream:
+        # Rows are fetched in batches and written as they arrive, memory stays flat
+        return StreamingResponse(_stream_tasks(statement, stream), media_type=STREAM_MEDIA_TYPES[stream])
+
+    async def load_tasks() -> list[dict]:
+        tasks = [row._asdict() for row in (await db.execute(statement)).all()]
         logger.info(f"Found {len(tasks)} tasks for user {current_user.id}")
         return tasks
 
+    def next_cursor(tasks: list[dict]) -> dict[str, str]:
+        if not limit or len(tasks) < limit:
+            return {}
+        return {"X-Next-Cursor": _encode_cursor(tasks[-1]["date"], tasks[-1]["id"])}
+
+    params = {
+        "limit": limit,
+        "cursor": cursor,
+        "fields": columns,
+        "difficulty": difficulty,
+        "platform": platform,
+        "date_from": date_from,
+        "date_to": date_to,
+    }
+
+    try:
+        return await get_stats_cache().respond_async(
+            request, current_user.id, "tasks", params, load_tasks, extra_headers=next_cursor
+        )
+
     except Exception as e:
         logger.error(f"Error fetching tasks for user {current_user.id}: {e!s}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to fetch tasks: {e!s}") from e
 
 
+def _stream_tasks(statement: Select, stream: str) -> Iterator[str]:
+    """
+    Serialize tasks batch by batch from a dedicated session.
+
+    The request session may be closed before the body is sent, so the stream
+    opens its own and closes it once exhausted.
+    """
+    db = SessionLocal()
+    try:
+        ndjson = stream == "ndjson"
+        batch: list[str] = []
+        first = True
+        if not ndjson:
+            yield "["
+
+        for row in db.execute(statement.execution_options(yield_per=STREAM_BATCH_SIZE)):
+            batch.append(json.dumps(row._asdict(), default=str, ensure_ascii=False))
+            if len(batch) >= STREAM_BATCH_SIZE:
+                yield _stream_chunk(batch, ndjson=ndjson, first=first)
+                batch, first = [], False
+
+        if batch:
+            yield _stream_chunk(batch, ndjson=ndjson, first=first)
+        if not ndjson:
+            yield "]"
+    finally:
+        db.close()
+
+
+def _stream_chunk(items: list[str], *, ndjson: bool, first: bool) -> str:
+    """Join serialized tasks into one NDJSON or JSON-array chunk."""
+    if ndjson:
+        return "\n".join(items) + "\n"
+    return ("" if first else ",") + ",".join(items)
+
+
+def _parse_fields(fields: str | None) -> list[str]:
+    """Validate a ``fields=`` projection; the keyset columns are always selected."""
+    if not fields:
+        return list(TASK_FIELDS)
+
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = sorted(set(requested) - set(TASK_FIELDS))
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(TASK_FIELDS)}"
+        )
+
+    return [field for field in TASK_FIELDS if field in CURSOR_FIELDS or field in requested]
+
+
+def _encode_cursor(task_date: date | str, task_id: int) -> str:
+    """Encode the (date, id) of the last task on a page as an opaque cursor."""
+    return base64.urlsafe_b64encode(f"{task_date}|{task_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[date, int]:
+    """Decode a cursor produced by ``_encode_cursor``."""
+    try:
+        task_date, task_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return date.fromisoformat(task_date), int(task_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+
 @router.delete("/api/task/{task_id}")
 def delete_task(
     task_id: int,
@@ -106,7 +257,9 @@ def delete_task(
             raise HTTPException(status_code=404, detail="Task not found or access denied")
 
         db.delete(task)
+        refresh_daily_stats(db, current_user.id, [task.date])
         db.commit()
+        invalidate_user_stats(current_user.id)
 
         logger.info(f"Task {task_id} successfully deleted for user {current_user.id}")
         return {"message": "Task deleted successfully"}
@@ -140,6 +293,7 @@ def update_task(
             logger.warning(f"Task {task_id} not found for user {current_user.id}")
             raise HTTPException(status_code=404, detail="Task not found or access denied")
 
+        old_date = task.date
         task.date = task_data.date
         task.difficulty = task_data.difficulty
         task.points = task_data.points
@@ -150,7 +304,9 @@ def update_task(
         if hasattr(task_data, "time_spent") and task_data.time_spent is not None:
             task.time_spent = task_data.time_spent
 
+        refresh_daily_stats(db, current_user.id, [old_date, task.date])
         db.commit()
+        invalidate_user_stats(current_user.id)
         db.refresh(task)
 
         logger.info(f"Task {task_id} successfully updated for user {current_user.id}")
@@ -173,7 +329,9 @@ def clear_all_tasks(
 
     try:
         deleted_count = db.query(models.SolvedTask).filter(models.SolvedTask.user_id == current_user.id).delete()
+        clear_daily_stats(db, current_user.id)
         db.commit()
+        invalidate_user_stats(current_user.id)
 
         logger.info(f"Successfully deleted {deleted_count} tasks for user {current_user.id}")
         return {"deleted": deleted_count, "message": f"Successfully deleted {deleted_count} tasks"}
@@ -188,149 +346,91 @@ def clear_all_tasks(
 async def import_csv_file(
     file: Annotated[UploadFile, File()],
     current_user: Annotated[models.User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
+    *,
+    background: bool = False,
 ):
-    """Import tasks from uploaded CSV file."""
-    logger.info(f"Starting CSV import for user {current_user.id}, file: {file.filename}")
+    """
+    Import tasks from uploaded CSV file.
 
-    try:
-        # Read file content
-        content = await file.read()
-        logger.info(f"File size: {len(content)} bytes")
-
-        # Try different encodings
-        text_content = None
-        for encoding in ["utf-8", "cp1251", "windows-1251", "iso-8859-1"]:
-            try:
-                text_content = content.decode(encoding)
-                logger.info(f"Successfully decoded file using {encoding}")
-                break
-            except UnicodeDecodeError:
-                logger.debug(f"Failed to decode with {encoding}")
-                continue
-
-        if text_content is None:
-            logger.error("Failed to decode file with any encoding")
-            return JSONResponse(
-                status_code=400,
-                content={"error": "Не удалось прочитать файл. Попробуйте сохранить файл в кодировке UTF-8"},
-            )
-
-        # Parse CSV
-        csv_file = io.StringIO(text_content)
-        reader = csv.DictReader(csv_file)
-
-        # Log CSV headers
-        if reader.fieldnames:
-            logger.info(f"CSV headers: {reader.fieldnames}")
-
-        imported_count = 0
-        errors = []
-
-        for row_num, row in enumerate(reader, start=2):
-            try:
-                logger.debug(f"Processing row {row_num}: {row}")
-
-                # Check if it's aggregate format (easy/medium/hard columns)
-                if "easy" in row or "medium" in row or "hard" in row:
-                    logger.debug(f"Row {row_num}: Using aggregate format")
-                    task_date = date.fromisoformat(row["date"])
-
-                    # Import Easy tasks
-                    easy_count = int(row.get("easy", 0) or 0)
-                    for i in range(easy_count):
-                        task = models.SolvedTask(
-                            user_id=current_user.id,
-                            date=task_date,
-                            difficulty="Easy",
-                            points=1,
-                            title=row.get("title", f"Imported Easy task {i + 1}")
-                            if "title" in row
-                            else f"Imported Easy task {i + 1}",
-                            notes="Imported from CSV",
-                        )
-                        db.add(task)
-                        imported_count += 1
-
-                    # Import Medium tasks
-                    medium_count = int(row.get("medium", 0) or 0)
-                    for i in range(medium_count):
-                        task = models.SolvedTask(
-                            user_id=current_user.id,
-                            date=task_date,
-                            difficulty="Medium",
-                            points=3,
-                            title=row.get("title", f"Imported Medium task {i + 1}")
-                            if "title" in row
-                            else f"Imported Medium task {i + 1}",
-                            notes="Imported from CSV",
-                        )
-                        db.add(task)
-                        imported_count += 1
-
-                    # Import Hard tasks
-                    hard_count = int(row.get("hard", 0) or 0)
-                    for i in range(hard_count):
-                        task = models.SolvedTask(
-                            user_id=current_user.id,
-                            date=task_date,
-                            difficulty="Hard",
-                            points=5,
-                            title=row.get("title", f"Imported Hard task {i + 1}")
-                            if "title" in row
-                            else f"Imported Hard task {i + 1}",
-                            notes="Imported from CSV",
-                        )
-                        db.add(task)
-                        imported_count += 1
-
-                    logger.debug(
-                        f"Row {row_num}: Imported {easy_count} Easy, {medium_count} Medium, {hard_count} Hard tasks"
-                    )
-
-                else:
-                    # Individual task format
-                    logger.debug(f"Row {row_num}: Using individual task format")
-                    task_date = date.fromisoformat(row["date"])
-                    difficulty = row.get("difficulty", "Medium")
-
-                    if row.get("points"):
-                        points = int(row["points"])
-                    else:
-                        points = {"Easy": 1, "Medium": 3, "Hard": 5}.get(difficulty, 3)
-
-                    task = models.SolvedTask(
-                        user_id=current_user.id,
-                        date=task_date,
-                        difficulty=difficulty,
-                        points=points,
-                        title=row.get("title", None) or None,
-                        problem_id=row.get("problem_id", None) or None,
-                        notes=row.get("notes", "Imported from CSV") or "Imported from CSV",
-                    )
-                    db.add(task)
-                    imported_count += 1
-                    logger.debug(f"Row {row_num}: Imported 1 {difficulty} task")
-
-            except Exception as e:
-                error_msg = f"Строка {row_num}: {e!s}"
-                errors.append(error_msg)
-                logger.error(f"Error processing row {row_num}: {e!s}", exc_info=True)
-
-        # Commit all changes
-        db.commit()
-        logger.info(f"CSV import completed: {imported_count} tasks imported, {len(errors)} errors")
+    With ``background=true`` the upload is persisted and imported by a background
+    job in committed batches; the job id is returned right away (202) and
+    progress is available at ``GET /api/import/jobs/{job_id}``.
+    """
+    logger.info(f"Starting CSV import for user {current_user.id}, file: {file.filename}, background: {background}")
 
-        message = f"Успешно импортировано {imported_count} задач"
-        max_errors_to_show = 5
-        if errors:
-            message += "\n\nОшибки:\n" + "\n".join(errors[:max_errors_to_show])
-            if len(errors) > max_errors_to_show:
-                message += f"\n... и еще {len(errors) - max_errors_to_show} ошибок"
+    if background:
+        try:
+            job = await run_in_db_executor(_create_import_job, file.file, current_user.id, file.filename)
+        except Exception as e:
+            logger.error(f"Failed to create import job for user {current_user.id}: {e!s}", exc_info=True)
+            raise HTTPException(status_code=500, detail=f"Failed to create import job: {e!s}") from e
 
-        return {"imported": imported_count, "message": message, "errors": errors if errors else None}
+        get_import_job_manager().submit(job["id"])
+        return JSONResponse(status_code=202, content=jsonable_encoder(job))
 
+    try:
+        # Parsing and bulk inserts run in the DB executor, reading the spooled upload incrementally
+        result = await run_in_db_executor(_import_csv, file.file, current_user.id)
     except Exception as e:
         logger.error(f"CSV import failed for user {current_user.id}: {e!s}", exc_info=True)
-        db.rollback()
         return JSONResponse(status_code=400, content={"error": f"Ошибка импорта: {e!s}"})
+
+    invalidate_user_stats(current_user.id)
+
+    imported_count = result["imported"]
+    error_count = result["error_count"]
+    errors = result["errors"]
+    logger.info(f"CSV import completed: {imported_count} tasks imported, {error_count} errors")
+
+    message = _import_message(imported_count, error_count, errors)
+    return {"imported": imported_count, "message": message, "errors": errors if errors else None}
+
+
+@router.get("/api/import/jobs/{job_id}")
+def get_import_job(
+    job_id: str,
+    current_user: Annotated[models.User, Depends(get_current_user)],
+    db: Annotated[Session, Depends(get_db)],
+):
+    """Get the status, progress and throughput of a background import job."""
+    job = (
+        db.query(models.ImportJob)
+        .filter(models.ImportJob.id == job_id, models.ImportJob.user_id == current_user.id)
+        .first()
+    )
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+
+    progress = import_job_progress(job)
+    if job.status == COMPLETED:
+        progress["message"] = _import_message(job.tasks_imported, job.error_count, job.errors or [])
+    return progress
+
+
+def _import_message(imported_count: int, error_count: int, errors: list[str]) -> str:
+    """Summary shown to the user after an import, with the first few row errors."""
+    message = f"Успешно импортировано {imported_count} задач"
+    max_errors_to_show = 5
+    if errors:
+        message += "\n\nОшибки:\n" + "\n".join(errors[:max_errors_to_show])
+        if error_count > max_errors_to_show:
+            message += f"\n... и еще {error_count - max_errors_to_show} ошибок"
+    return message
+
+
+def _create_import_job(binary: BinaryIO, user_id: int, filename: str | None) -> dict[str, Any]:
+    """Persist an upload as a background import job in a fresh session (blocking)."""
+    db = SessionLocal()
+    try:
+        return import_job_progress(create_import_job(db, user_id, filename, binary))
+    finally:
+        db.close()
+
+
+def _import_csv(binary: BinaryIO, user_id: int) -> dict[str, Any]:
+    """Import a CSV upload in a fresh session (blocking)."""
+    db = SessionLocal()
+    try:
+        return import_csv(db, binary, user_id, settings.csv_import_batch_size)
+    finally:
+        db.close()
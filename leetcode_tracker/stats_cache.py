@@ -0,0 +1,325 @@
+"""
+Per-User Stats Cache.
+
+Caches dashboard responses keyed by (user, endpoint, params). Every key embeds
+the user's version counter, and writers bump the counter after committing task
+changes, so stale entries are never read again and simply age out. The same
+version backs the responses' ETags, so unchanged data is answered with 304.
+
+The in-process LRU backend is the default. With several app workers, configure
+``stats_cache_redis_url`` so all of them share entries and version counters.
+"""
+
+from collections.abc import Awaitable, Callable
+from functools import lru_cache
+import hashlib
+import json
+import logging
+import secrets
+import threading
+from typing import Any, Protocol
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from .cache import TTLCache
+from .config import settings
+
+
+try:
+    import redis
+except ImportError:  # optional 'redis' extra
+    redis = None
+
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "stats"
+# Seconds to wait for Redis before treating the cache as unavailable
+REDIS_TIMEOUT = 1.0
+
+
+HTTP_NOT_MODIFIED = 304
+
+
+def _key_params(user_id: int, endpoint: str, params: dict[str, Any]) -> str:
+    """Identify a response independently of the data version."""
+    return f"{user_id}:{endpoint}:{json.dumps(params, sort_keys=True, default=str)}"
+
+
+def _etag_matches(if_none_match: str | None, etag: str | None) -> bool:
+    """Check an ``If-None-Match`` header against an ETag (weak comparison); no ETag never matches."""
+    if not if_none_match or etag is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tag = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == tag for candidate in if_none_match.split(","))
+
+
+class StatsCacheBackend(Protocol):
+    """Storage for cached responses and per-user version counters."""
+
+    # Changes whenever version counters may have been reset (e.g. process restart)
+    epoch: str
+
+    def get(self, key: str) -> Any | None: ...
+
+    def set(self, key: str, value: Any, ttl: int) -> None: ...
+
+    def get_version(self, user_id: int) -> int: ...
+
+    def bump_version(self, user_id: int) -> None: ...
+
+
+class MemoryBackend:
+    """In-process LRU backend, shared by the request threads of one worker."""
+
+    def __init__(self, max_size: int) -> None:
+        """
+        Initialize backend.
+
+        Args:
+            max_size: Maximum number of cached responses
+
+        """
+        self.cache = TTLCache(max_size)
+        self.epoch = secrets.token_hex(4)
+        self._versions: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            return self.cache.get(key)
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        with self._lock:
+            self.cache.set(key, value, ttl)
+
+    def get_version(self, user_id: int) -> int:
+        return self._versions.get(user_id, 0)
+
+    def bump_version(self, user_id: int) -> None:
+        with self._lock:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
+
+class RedisBackend:
+    """Redis (or any Redis-compatible server) backend, shared by all workers."""
+
+    def __init__(self, url: str) -> None:
+        """
+        Connect to Redis.
+
+        Args:
+            url: Redis URL, e.g. ``redis://localhost:6379/0``
+
+        """
+        if redis is None:
+            raise ImportError("the 'redis' package is required for the Redis stats cache backend")
+
+        # Connects lazily: nothing here touches the network, so an unreachable server
+        # only makes the (guarded) cache calls fail instead of the app's startup
+        self.client = redis.Redis.from_url(url, socket_connect_timeout=REDIS_TIMEOUT, socket_timeout=REDIS_TIMEOUT)
+        self.epoch: str | None = None
+
+    def _load_epoch(self) -> None:
+        """Read the shared epoch once; it is only regenerated if Redis lost its data (and with it the versions)."""
+        if self.epoch is None:
+            self.client.set(f"{KEY_PREFIX}:epoch", secrets.token_hex(4), nx=True)
+            self.epoch = self.client.get(f"{KEY_PREFIX}:epoch").decode()
+
+    def get(self, key: str) -> Any | None:
+        raw = self.client.get(key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        self.client.set(key, json.dumps(value), ex=ttl)
+
+    def get_version(self, user_id: int) -> int:
+        # Versions are only meaningful together with the epoch used in ETags
+        self._load_epoch()
+        raw = self.client.get(f"{KEY_PREFIX}:version:{user_id}")
+        return int(raw) if raw is not None else 0
+
+    def bump_version(self, user_id: int) -> None:
+        self.client.incr(f"{KEY_PREFIX}:version:{user_id}")
+
+
+class StatsCache:
+    """Version-invalidated cache of per-user stats responses."""
+
+    def __init__(self, backend: StatsCacheBackend | None, ttl: int) -> None:
+        """
+        Initialize cache.
+
+        Args:
+            backend: Storage backend, None disables caching
+            ttl: Seconds an entry is kept, bounds staleness if an invalidation is missed
+
+        """
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    async def respond_async(
+        self,
+        request: Request,
+        user_id: int,
+        endpoint: str,
+        params: dict[str, Any],
+        compute: Callable[[], Awaitable[Any]],
+        *,
+        extra_headers: Callable[[Any], dict[str, str]] | None = None,
+    ) -> Response:
+        """
+        Build a JSON response with an ETag, or 304 if the client's copy is current.
+
+        The ETag is derived from the user's version counter, so a matching
+        ``If-None-Match`` is answered without querying or serializing anything.
+
+        Args:
+            request: Incoming request (for ``If-None-Match``)
+            user_id: Owner of the data
+            endpoint: Endpoint name
+            params: Request parameters that change the response
+            compute: Coroutine function building the response from the database, awaited on a miss
+            extra_headers: Builds additional headers (e.g. a pagination cursor) from the response body
+
+        Returns:
+            304 response or JSON response
+
+        """
+        version, headers = self._validators(user_id, endpoint, params)
+        if _etag_matches(request.headers.get("if-none-match"), headers.get("ETag")):
+            self.not_modified += 1
+            return Response(status_code=HTTP_NOT_MODIFIED, headers=headers)
+
+        key, value = self._lookup(user_id, version, endpoint, params)
+        if value is None:
+            value = jsonable_encoder(await compute())
+            self._store(key, value, endpoint)
+        return self._response(value, headers, extra_headers)
+
+    def get_version(self, user_id: int) -> int | None:
+        """Return the user's data version, or None if caching is disabled or unavailable."""
+        if self.backend is None:
+            return None
+
+        try:
+            return self.backend.get_version(user_id)
+        except Exception as e:
+            logger.warning(f"Stats cache unavailable: {e}")
+            return None
+
+    def _validators(self, user_id: int, endpoint: str, params: dict[str, Any]) -> tuple[int | None, dict[str, str]]:
+        """Return the user's version and the ETag headers for it (none if caching is unavailable)."""
+        version = self.get_version(user_id)
+        if version is None:
+            return None, {}
+        return version, {"ETag": self._etag(user_id, version, endpoint, params), "Cache-Control": "private, no-cache"}
+
+    def _etag(self, user_id: int, version: int, endpoint: str, params: dict[str, Any]) -> str:
+        """Weak ETag for a response; the backend epoch keeps tags unique across restarts."""
+        digest = hashlib.blake2b(_key_params(user_id, endpoint, params).encode(), digest_size=8).hexdigest()
+        return f'W/"{self.backend.epoch}-{version}-{digest}"'
+
+    def _lookup(
+        self, user_id: int, version: int | None, endpoint: str, params: dict[str, Any]
+    ) -> tuple[str | None, Any | None]:
+        """
+        Look up the response stored for ``version``.
+
+        The version is read before computing, so a write committed meanwhile bumps
+        it and a result computed now is stored under a key nobody reads anymore.
+
+        Returns:
+            ``(key, value)``: the key to store a computed value under (None if caching is
+            unavailable) and the cached value (None on a miss)
+
+        """
+        if version is None:
+            return None, None
+
+        key = f"{KEY_PREFIX}:{version}:{_key_params(user_id, endpoint, params)}"
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Stats cache unavailable, computing {endpoint} directly: {e}")
+            return None, None
+
+        if value is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return key, value
+
+    def _store(self, key: str | None, value: Any, endpoint: str) -> None:
+        """Store a computed response, if caching is available."""
+        if key is None:
+            return
+
+        try:
+            self.backend.set(key, value, self.ttl)
+        except Exception as e:
+            logger.warning(f"Failed to store {endpoint} in stats cache: {e}")
+
+    @staticmethod
+    def _response(
+        value: Any, headers: dict[str, str], extra_headers: Callable[[Any], dict[str, str]] | None
+    ) -> JSONResponse:
+        """Wrap a response body with its validators and any extra headers."""
+        if extra_headers is not None:
+            headers = {**headers, **extra_headers(value)}
+        return JSONResponse(value, headers=headers)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Make every cached response of the user stale (call after committing task changes)."""
+        if self.backend is None:
+            return
+
+        try:
+            self.backend.bump_version(user_id)
+        except Exception as e:
+            logger.error(f"Failed to invalidate stats cache for user {user_id}: {e}")
+
+    def stats(self) -> dict[str, Any]:
+        """Return cache counters."""
+        stats: dict[str, Any] = {
+            "backend": type(self.backend).__name__ if self.backend is not None else "disabled",
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+        }
+        if isinstance(self.backend, MemoryBackend):
+            stats["size"] = self.backend.cache.stats()["size"]
+        return stats
+
+
+@lru_cache(maxsize=1)
+def get_stats_cache() -> StatsCache:
+    """Get or create the global stats cache."""
+    if not settings.stats_cache_enabled:
+        return StatsCache(None, settings.stats_cache_ttl)
+
+    if settings.stats_cache_redis_url:
+        try:
+            backend = RedisBackend(settings.stats_cache_redis_url)
+            logger.info("Stats cache: using Redis backend")
+            return StatsCache(backend, settings.stats_cache_ttl)
+        except ImportError:
+            logger.error("stats_cache_redis_url is set but the 'redis' package is not installed, caching disabled")
+        except Exception as e:
+            logger.error(f"Invalid stats cache Redis configuration, caching disabled: {e}")
+        # A per-process memory cache would serve stale data across workers, so don't cache at all
+        return StatsCache(None, settings.stats_cache_ttl)
+
+    return StatsCache(MemoryBackend(settings.stats_cache_size), settings.stats_cache_ttl)
+
+
+def invalidate_user_stats(user_id: int) -> None:
+    """Bump the user's stats version after committing changes to their tasks or goals."""
+    get_stats_cache().invalidate_user(user_id)
@@ -0,0 +1,141 @@
+"""
+Synced Task Writer.
+
+Turns LeetCode accepted submissions into ``solved_tasks`` rows with one
+existence query and one bulk insert per batch.
+"""
+
+from datetime import datetime, timezone
+import logging
+from typing import Any
+
+from sqlalchemy import Insert, insert
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from .daily_stats import refresh_daily_stats
+from .models import SolvedTask
+
+
+logger = logging.getLogger(__name__)
+
+
+def calculate_xp(difficulty: str) -> int:
+    """Calculate XP based on difficulty."""
+    xp_map = {"Easy": 1, "Medium": 3, "Hard": 5}
+    return xp_map.get(difficulty, 3)
+
+
+# Columns of the unique sync identity index on solved_tasks
+SYNC_IDENTITY = ("user_id", "title_slug", "date")
+
+
+def _insert_ignore_duplicates(db: Session) -> Insert:
+    """
+    Build a dialect-aware insert that skips rows violating the sync identity index.
+
+    PostgreSQL gets ``INSERT ... ON CONFLICT DO NOTHING``, SQLite ``INSERT OR IGNORE``.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(SolvedTask).on_conflict_do_nothing(index_elements=list(SYNC_IDENTITY))
+    if dialect == "sqlite":
+        return insert(SolvedTask).prefix_with("OR IGNORE")
+    return insert(SolvedTask)
+
+
+def insert_new_tasks(db: Session, rows: list[dict[str, Any]]) -> int:
+    """
+    Bulk insert task rows, skipping those whose (user, slug, date) is already stored.
+
+    Args:
+        db: Database session
+        rows: Task rows with the same keys
+
+    Returns:
+        Number of rows actually inserted
+
+    """
+    stmt = _insert_ignore_duplicates(db)
+    if not db.get_bind().dialect.insert_executemany_returning:
+        db.execute(stmt, rows)
+        return len(rows)
+
+    # RETURNING only yields rows that were actually inserted
+    return len(db.execute(stmt.returning(SolvedTask.id), rows).all())
+
+
+def save_submissions(
+    db: Session,
+    user_id: int,
+    submissions: list[dict[str, Any]],
+    difficulties: dict[str, str],
+    note: str = "Synced from LeetCode",
+) -> int:
+    """
+    Insert submissions that are not stored as tasks yet.
+
+    A task is identified by (user, title, date). Existing keys for the fetched
+    window are loaded in one query, diffed in memory and the remainder is bulk
+    inserted. The insert ignores rows that hit the unique (user, slug, date)
+    index, so overlapping sync runs cannot create duplicates. The daily stats
+    rollup is refreshed for the inserted days. The caller commits.
+
+    Args:
+        db: Database session
+        user_id: Owner of the tasks
+        submissions: LeetCode accepted submissions
+        difficulties: Problem slug to difficulty mapping
+        note: Prefix for the task notes
+
+    Returns:
+        Number of tasks inserted
+
+    """
+    rows: dict[tuple[str, Any], dict[str, Any]] = {}
+
+    for submission in submissions:
+        try:
+            submission_date = datetime.fromtimestamp(int(submission["timestamp"]), tz=timezone.utc).date()
+            title = submission["title"]
+            difficulty = difficulties.get(submission["titleSlug"], "Medium")
+        except (KeyError, TypeError, ValueError) as e:
+            logger.error(f"Error processing submission {submission.get('title')}: {e}")
+            continue
+
+        # The same problem solved twice on one day is a single task
+        rows.setdefault(
+            (title, submission_date),
+            {
+                "user_id": user_id,
+                "date": submission_date,
+                "title": title,
+                "title_slug": submission["titleSlug"],
+                "problem_id": submission.get("id"),
+                "difficulty": difficulty,
+                "points": calculate_xp(difficulty),
+                "platform": "leetcode",
+                "notes": f"{note} (Language: {submission.get('lang', 'Unknown')})",
+            },
+        )
+
+    if not rows:
+        return 0
+
+    dates = [submission_date for _, submission_date in rows]
+    existing = set(
+        db.query(SolvedTask.title, SolvedTask.date).filter(
+            SolvedTask.user_id == user_id,
+            SolvedTask.date >= min(dates),
+            SolvedTask.date <= max(dates),
+            SolvedTask.title.in_({title for title, _ in rows}),
+        )
+    )
+
+    new_rows = [row for key, row in rows.items() if key not in existing]
+    if not new_rows:
+        return 0
+
+    inserted = insert_new_tasks(db, new_rows)
+    refresh_daily_stats(db, user_id, {row["date"] for row in new_rows})
+    return inserted
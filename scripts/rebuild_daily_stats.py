@@ -0,0 +1,35 @@
+"""
+Rebuild the user_daily_stats rollup from solved_tasks.
+
+Usage:
+    python scripts/rebuild_daily_stats.py            # all users
+    python scripts/rebuild_daily_stats.py <user_id>  # one user
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from leetcode_tracker.daily_stats import rebuild_daily_stats
+from leetcode_tracker.database import SessionLocal
+
+
+def rebuild(user_id: int | None = None):
+    db = SessionLocal()
+    try:
+        rows = rebuild_daily_stats(db, user_id)
+        db.commit()
+        target = f"user {user_id}" if user_id is not None else "all users"
+        print(f"✅ Daily stats rebuilt for {target}: {rows} rows")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Rebuild failed: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild(int(sys.argv[1]) if len(sys.argv) > 1 else None)